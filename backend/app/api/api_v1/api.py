@@ -1,7 +1,9 @@
 from fastapi import APIRouter
-from app.api.api_v1.endpoints import career, jobs
+from app.api.api_v1.endpoints import admin, career, jobs, skills
 
 api_router = APIRouter()
 
 api_router.include_router(career.router, prefix="/career", tags=["career"])
 api_router.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
+api_router.include_router(skills.router, prefix="/skills", tags=["skills"])
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
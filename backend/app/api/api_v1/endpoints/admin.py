@@ -0,0 +1,46 @@
+import hmac
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Query
+from fastapi.responses import PlainTextResponse
+from app.core.config import settings
+from app.core.profiling import profile_store
+
+def require_admin_token(x_admin_token: str = Header("")):
+    """Admin endpoints are disabled unless ADMIN_TOKEN is set, and require it in X-Admin-Token."""
+    if not settings.ADMIN_TOKEN or not hmac.compare_digest(x_admin_token, settings.ADMIN_TOKEN):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin token required"
+        )
+
+router = APIRouter(dependencies=[Depends(require_admin_token)])
+
+@router.get("/profiles")
+async def list_profiles():
+    """
+    List the slowest captured request profiles.
+    """
+    return [record.summary() for record in profile_store.list()]
+
+@router.get("/profiles/{profile_id}", response_class=PlainTextResponse)
+async def get_profile(
+    profile_id: int,
+    format: str = Query("pstats", description="pstats or collapsed"),
+    limit: int = Query(50, description="Functions shown in the pstats report")
+):
+    """
+    Get one profile as a pstats report or as collapsed stacks for flame graphs.
+    """
+    record = profile_store.get(profile_id)
+    if not record:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    if format == "collapsed":
+        return record.collapsed()
+    if format == "pstats":
+        return record.pstats_text(limit)
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="format must be 'pstats' or 'collapsed'"
+    )
@@ -2,14 +2,14 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from app.schemas.career import SkillAnalysisRequest, SkillAnalysisResponse
 from app.services.career_service import CareerAdvisorService
-from app.core.database import get_db
+from app.core.database import get_read_db
 
 router = APIRouter()
 
 @router.post("/analyze-skills", response_model=SkillAnalysisResponse)
 async def analyze_skills_and_recommend_careers(
     request: SkillAnalysisRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Analyze user skills and recommend matching career paths.
@@ -35,7 +35,7 @@ async def analyze_skills_and_recommend_careers(
 async def analyze_skill_gaps(
     user_skills: list[str],
     target_job_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Analyze skill gaps between user's current skills and a target job.
@@ -54,7 +54,7 @@ async def analyze_skill_gaps(
 async def get_learning_path(
     job_role_id: int,
     user_skills: list[str] = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get a personalized learning path for a specific job role.
@@ -1,10 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import logging
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from app.models.database import JobRole
+from app.models.database import JobRole, JobNeighbor, JobSkill
 from app.schemas.career import JobRole as JobRoleSchema, JobRoleCreate
-from app.core.database import get_db
-from app.services.ai_service import EmbeddingService, VectorDatabaseService
+from app.core.database import get_db, get_read_db
+from app.services.ai_service import get_embedding_service, get_vector_search
+from app.services.bulk_import import format_for_content_type, import_jobs, parse_rows
+from app.services.career_service import load_jobs_by_id
+from app.services.facet_index import get_facet_index
+from app.services.indexing_service import INDEXING_PENDING, enqueue_job_indexing
+from app.services.job_indexes import index_added_jobs, index_removed_job, load_job_indexes
+from app.services.job_skills import filter_jobs_by_skills, link_job_skills
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -14,10 +24,14 @@ async def get_jobs(
     limit: int = 100,
     industry: Optional[str] = None,
     experience_level: Optional[str] = None,
-    db: Session = Depends(get_db)
+    skills: Optional[List[str]] = Query(None, description="Only jobs requiring these skills"),
+    skills_match: str = Query("any", pattern="^(any|all)$", description="Require any or all of the skills"),
+    db: Session = Depends(get_read_db)
 ):
     """
     Get list of job roles with optional filtering.
+    
+    The skills filter is matched on normalized names via the job_skills table.
     """
     query = db.query(JobRole)
     
@@ -25,12 +39,32 @@ async def get_jobs(
         query = query.filter(JobRole.industry == industry)
     if experience_level:
         query = query.filter(JobRole.experience_level == experience_level)
+    if skills:
+        query = filter_jobs_by_skills(db, query, skills, skills_match)
     
-    jobs = query.offset(skip).limit(limit).all()
+    jobs = query.order_by(JobRole.id).offset(skip).limit(limit).all()
     return jobs
 
+@router.get("/facets")
+async def get_job_facets(
+    industry: Optional[str] = None,
+    experience_level: Optional[str] = None,
+    skills: Optional[List[str]] = Query(None, description="Only jobs requiring these skills"),
+    skills_match: str = Query("any", pattern="^(any|all)$", description="Require any or all of the skills")
+):
+    """
+    Get job counts per industry, experience level and location.
+    
+    Accepts the same filters as the job listing; counts come from an
+    in-memory index, not SQL.
+    """
+    return get_facet_index().counts({
+        "industry": industry,
+        "experience_level": experience_level
+    }, skills=skills, skills_match=skills_match)
+
 @router.get("/{job_id}", response_model=JobRoleSchema)
-async def get_job(job_id: int, db: Session = Depends(get_db)):
+async def get_job(job_id: int, db: Session = Depends(get_read_db)):
     """
     Get a specific job role by ID.
     """
@@ -48,51 +82,84 @@ async def create_job(
     db: Session = Depends(get_db)
 ):
     """
-    Create a new job role and generate its embedding.
+    Create a new job role and queue it for embedding.
+    
+    The row and its outbox entry are committed together; the indexing worker
+    embeds and upserts it asynchronously (see `indexing_status`).
     """
+    indexes = load_job_indexes()
     try:
-        # Create job in database
-        db_job = JobRole(**job.dict())
+        db_job = JobRole(**job.dict(), indexing_status=INDEXING_PENDING)
         db.add(db_job)
+        db.flush()
+        link_job_skills(db, [db_job])
+        enqueue_job_indexing(db, [db_job.id])
         db.commit()
         db.refresh(db_job)
-        
-        # Generate and store embedding
-        embedding_service = EmbeddingService()
-        vector_db = VectorDatabaseService()
-        
-        # Create text for embedding
-        job_text = f"{job.title}. {job.description}. Required skills: {', '.join(job.required_skills)}. Industry: {job.industry}"
-        
-        # Get embedding
-        embedding = await embedding_service.get_embedding(job_text)
-        
-        # Store in vector database
-        metadata = {
-            "title": job.title,
-            "industry": job.industry,
-            "experience_level": job.experience_level,
-            "career_path": job.career_path
-        }
-        
-        await vector_db.upsert_job_embedding(
-            job_id=str(db_job.id),
-            embedding=embedding,
-            metadata=metadata
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error creating job: {str(e)}"
         )
-        
-        # Update job with embedding ID
-        db_job.embedding_id = str(db_job.id)
+    
+    index_added_jobs(indexes, [db_job])
+    return db_job
+
+@router.post("/bulk")
+async def bulk_import_jobs(request: Request, db: Session = Depends(get_db)):
+    """
+    Import jobs from an NDJSON (`application/x-ndjson`) or CSV (`text/csv`) body.
+    
+    The body is read as a stream and rows are validated and inserted in
+    batches, so memory use does not grow with the upload. Invalid rows are
+    skipped and reported by line number; valid rows are queued for embedding
+    like single creates.
+    """
+    data_format = format_for_content_type(request.headers.get("content-type", ""))
+    if data_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Expected application/x-ndjson or text/csv"
+        )
+    
+    return await import_jobs(db, parse_rows(request.stream(), data_format))
+
+@router.delete("/{job_id}")
+async def delete_job(job_id: int, db: Session = Depends(get_db)):
+    """
+    Delete a job role together with its precomputed neighbours.
+    
+    Its vector is removed by the indexing worker: the outbox entry committed
+    with the delete points at a job that no longer exists.
+    """
+    job = db.query(JobRole).filter(JobRole.id == job_id).first()
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job role not found"
+        )
+    
+    indexes = load_job_indexes()
+    try:
+        required_skills = job.required_skills
+        db.query(JobSkill).filter(JobSkill.job_role_id == job_id).delete(synchronize_session=False)
+        db.query(JobNeighbor).filter(
+            or_(JobNeighbor.job_role_id == job_id, JobNeighbor.neighbor_id == job_id)
+        ).delete(synchronize_session=False)
+        db.delete(job)
+        enqueue_job_indexing(db, [job_id])
         db.commit()
-        
-        return db_job
-        
     except Exception as e:
         db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error creating job: {str(e)}"
+            detail=f"Error deleting job: {str(e)}"
         )
+    
+    index_removed_job(indexes, job_id, required_skills)
+    
+    return {"message": "Job role deleted", "id": job_id}
 
 @router.get("/search/similar")
 async def search_similar_jobs(
@@ -100,14 +167,14 @@ async def search_similar_jobs(
     limit: int = Query(10, description="Number of results to return"),
     industry: Optional[str] = Query(None, description="Filter by industry"),
     experience_level: Optional[str] = Query(None, description="Filter by experience level"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Search for jobs similar to a query using vector similarity.
     """
     try:
-        embedding_service = EmbeddingService()
-        vector_db = VectorDatabaseService()
+        embedding_service = get_embedding_service()
+        vector_db = get_vector_search()
         
         # Get embedding for query
         query_embedding = await embedding_service.get_embedding(query)
@@ -126,11 +193,11 @@ async def search_similar_jobs(
             filters=filters if filters else None
         )
         
-        # Get job details from database
+        # Get job details from database in one query
+        jobs_by_id = load_jobs_by_id(db, [int(job_match['job_id']) for job_match in similar_jobs])
         results = []
         for job_match in similar_jobs:
-            job_id = int(job_match['job_id'])
-            job = db.query(JobRole).filter(JobRole.id == job_id).first()
+            job = jobs_by_id.get(int(job_match['job_id']))
             if job:
                 results.append({
                     "job": job,
@@ -144,3 +211,32 @@ async def search_similar_jobs(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error searching jobs: {str(e)}"
         )
+
+@router.get("/{job_id}/similar")
+async def get_similar_jobs(
+    job_id: int,
+    limit: int = Query(10, description="Number of results to return"),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get jobs similar to a job from the precomputed neighbour table.
+    
+    No embedding or vector-store call is made.
+    """
+    rows = (
+        db.query(JobNeighbor, JobRole)
+        .join(JobRole, JobRole.id == JobNeighbor.neighbor_id)
+        .filter(JobNeighbor.job_role_id == job_id)
+        .order_by(JobNeighbor.rank)
+        .limit(limit)
+        .all()
+    )
+    if not rows and not db.query(JobRole.id).filter(JobRole.id == job_id).first():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job role not found"
+        )
+    return [
+        {"job": job, "similarity_score": neighbor.similarity_score}
+        for neighbor, job in rows
+    ]
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Query
+from app.core.config import settings
+from app.services.skill_index import get_skill_index
+
+router = APIRouter()
+
+@router.get("/autocomplete")
+async def autocomplete_skills(
+    q: str = Query("", description="Skill prefix typed so far"),
+    limit: int = Query(10, ge=1, description="Maximum number of suggestions")
+):
+    """
+    Suggest skills starting with a prefix, ranked by how many jobs require them.
+    
+    Served from an in-memory prefix index; no database query per keystroke.
+    """
+    limit = min(limit, settings.SKILL_AUTOCOMPLETE_MAX_LIMIT)
+    return {
+        "query": q,
+        "suggestions": get_skill_index().suggest(q, limit)
+    }
@@ -0,0 +1,145 @@
+import asyncio
+import math
+import time
+from typing import List, Optional, Tuple
+from fastapi import status
+from fastapi.responses import JSONResponse
+from app.core.config import settings
+from app.core.metrics import metrics
+
+SHED_QUEUE_FULL = "queue_full"
+SHED_WAIT_TIMEOUT = "wait_timeout"
+
+class AdmissionLane:
+    """
+    Concurrency limit with a bounded wait queue. Requests that find the queue
+    full, or wait longer than max_wait_seconds for a slot, are shed.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int, max_wait_seconds: float):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_wait_seconds = max_wait_seconds
+        self.in_flight = 0
+        self.waiting = 0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    @property
+    def retry_after_seconds(self) -> int:
+        return max(1, math.ceil(self.max_wait_seconds))
+
+    async def acquire(self) -> Optional[str]:
+        """Wait for a slot. Returns None when admitted, otherwise the shed reason."""
+        if not self._semaphore.locked():
+            await self._semaphore.acquire()
+            self.in_flight += 1
+            return None
+        if self.waiting >= self.max_queue:
+            return SHED_QUEUE_FULL
+
+        self.waiting += 1
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.max_wait_seconds)
+        except asyncio.TimeoutError:
+            return SHED_WAIT_TIMEOUT
+        finally:
+            self.waiting -= 1
+            metrics.observe("admission_queue_wait_seconds", time.perf_counter() - start, lane=self.name)
+        self.in_flight += 1
+        return None
+
+    def release(self):
+        self.in_flight -= 1
+        self._semaphore.release()
+
+class AdmissionController:
+    """Maps requests to lanes: expensive routes get a small lane so cheap reads are never starved."""
+
+    def __init__(self, routes: List[Tuple[str, str, AdmissionLane]], default_lane: AdmissionLane, exempt_paths: Tuple[str, ...] = ()):
+        self.routes = routes
+        self.default_lane = default_lane
+        self.exempt_paths = exempt_paths
+        metrics.register_collector(self._gauges)
+
+    @property
+    def lanes(self) -> List[AdmissionLane]:
+        lanes = [self.default_lane]
+        for _, _, lane in self.routes:
+            if lane not in lanes:
+                lanes.append(lane)
+        return lanes
+
+    def lane_for(self, method: str, path: str) -> Optional[AdmissionLane]:
+        if path in self.exempt_paths:
+            return None
+        for route_method, route_path, lane in self.routes:
+            if method == route_method and path.rstrip("/") == route_path:
+                return lane
+        return self.default_lane
+
+    def _gauges(self):
+        for lane in self.lanes:
+            yield "admission_in_flight", {"lane": lane.name}, lane.in_flight
+            yield "admission_queue_depth", {"lane": lane.name}, lane.waiting
+            yield "admission_concurrency_limit", {"lane": lane.name}, lane.max_concurrency
+
+class AdmissionControlMiddleware:
+    """ASGI middleware applying an AdmissionController to every HTTP request."""
+
+    def __init__(self, app, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        lane = self.controller.lane_for(scope["method"], scope["path"])
+        if lane is None:
+            await self.app(scope, receive, send)
+            return
+
+        reason = await lane.acquire()
+        if reason is not None:
+            metrics.inc("admission_shed_total", lane=lane.name, reason=reason)
+            status_code = (
+                status.HTTP_503_SERVICE_UNAVAILABLE if reason == SHED_QUEUE_FULL
+                else status.HTTP_429_TOO_MANY_REQUESTS
+            )
+            response = JSONResponse(
+                {"detail": "Server is busy, please retry shortly"},
+                status_code=status_code,
+                headers={"Retry-After": str(lane.retry_after_seconds)}
+            )
+            await response(scope, receive, send)
+            return
+
+        metrics.inc("admission_admitted_total", lane=lane.name)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            lane.release()
+
+def create_admission_controller() -> AdmissionController:
+    """Build the lanes from settings. Limits apply per worker process."""
+    expensive = AdmissionLane(
+        "expensive",
+        max_concurrency=settings.ADMISSION_EXPENSIVE_CONCURRENCY,
+        max_queue=settings.ADMISSION_EXPENSIVE_QUEUE,
+        max_wait_seconds=settings.ADMISSION_EXPENSIVE_MAX_WAIT_MS / 1000
+    )
+    default = AdmissionLane(
+        "default",
+        max_concurrency=settings.ADMISSION_DEFAULT_CONCURRENCY,
+        max_queue=settings.ADMISSION_DEFAULT_QUEUE,
+        max_wait_seconds=settings.ADMISSION_DEFAULT_MAX_WAIT_MS / 1000
+    )
+    api = settings.API_V1_STR
+    routes = [
+        ("POST", f"{api}/career/analyze-skills", expensive),
+        ("GET", f"{api}/jobs/search/similar", expensive),
+    ]
+    return AdmissionController(routes, default, exempt_paths=("/health", "/health/startup", "/metrics"))
@@ -1,16 +1,74 @@
-from sqlalchemy import create_engine
+import time
+from sqlalchemy import create_engine, exc
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import QueuePool
 from app.core.config import settings
+from app.core.metrics import metrics
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait to check out a connection."""
+
+    metrics_label = "primary"
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            metrics.inc("db_pool_checkout_timeouts_total", pool=self.metrics_label)
+            raise
+        finally:
+            metrics.observe("db_pool_checkout_wait_seconds", time.perf_counter() - start, pool=self.metrics_label)
+
+def _create_engine(url: str, label: str) -> Engine:
+    # A subclass per engine keeps the label across pool.recreate() / dispose()
+    pool_class = type(f"{label.title()}QueuePool", (InstrumentedQueuePool,), {"metrics_label": label})
+    return create_engine(
+        url,
+        poolclass=pool_class,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING
+    )
+
+engine = _create_engine(settings.DATABASE_URL, "primary")
+# Read-only traffic goes to the replica when one is configured
+read_engine = _create_engine(settings.DATABASE_READ_URL, "replica") if settings.DATABASE_READ_URL else engine
 
-engine = create_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 Base = declarative_base()
 
+def _pool_gauges():
+    engines = {"primary": engine}
+    if read_engine is not engine:
+        engines["replica"] = read_engine
+    for label, pool_engine in engines.items():
+        pool = pool_engine.pool
+        yield "db_pool_size", {"pool": label}, pool.size()
+        yield "db_pool_checked_out", {"pool": label}, pool.checkedout()
+        yield "db_pool_checked_in", {"pool": label}, pool.checkedin()
+        yield "db_pool_overflow", {"pool": label}, max(pool.overflow(), 0)
+        yield "db_pool_capacity", {"pool": label}, pool.size() + settings.DB_MAX_OVERFLOW
+
+metrics.register_collector(_pool_gauges)
+
 def get_db() -> Session:
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+def get_read_db() -> Session:
+    """Session for read-only endpoints; uses the replica pool when DATABASE_READ_URL is set."""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -0,0 +1,141 @@
+import cProfile
+import heapq
+import hmac
+import io
+import itertools
+import pstats
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional
+from app.core.config import settings
+from app.core.metrics import metrics
+
+PROFILE_HEADER = b"x-debug-profile"
+
+def _function_label(func) -> str:
+    filename, line, name = func
+    return f"{filename}:{line}({name})"
+
+class ProfileRecord:
+    def __init__(self, profile_id: int, method: str, path: str, duration: float, profiler: cProfile.Profile):
+        self.id = profile_id
+        self.method = method
+        self.path = path
+        self.duration = duration
+        self.captured_at = datetime.now(timezone.utc)
+        self.stats = pstats.Stats(profiler)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "duration_ms": round(self.duration * 1000, 2),
+            "captured_at": self.captured_at.isoformat()
+        }
+
+    def pstats_text(self, limit: int = 50) -> str:
+        """Functions sorted by cumulative time, in the standard pstats report format."""
+        output = io.StringIO()
+        self.stats.stream = output
+        self.stats.sort_stats("cumulative").print_stats(limit)
+        return output.getvalue()
+
+    def collapsed(self) -> str:
+        """
+        Caller;callee pairs weighted by self time in microseconds, in the
+        collapsed-stack format flame graph tools read. cProfile only records
+        one level of callers, so each stack is two frames deep.
+        """
+        lines = []
+        for func, (_, _, tottime, _, callers) in self.stats.stats.items():
+            if not callers:
+                lines.append(f"{_function_label(func)} {int(tottime * 1e6)}")
+            for caller, caller_stats in callers.items():
+                weight = int(caller_stats[2] * 1e6)
+                if weight:
+                    lines.append(f"{_function_label(caller)};{_function_label(func)} {weight}")
+        return "\n".join(lines) + "\n"
+
+class ProfileStore:
+    """Keeps the N slowest profiles seen so far."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._heap: List[tuple] = []  # (duration, id, record), smallest duration first
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def next_id(self) -> int:
+        return next(self._ids)
+
+    def add(self, record: ProfileRecord):
+        with self._lock:
+            entry = (record.duration, record.id, record)
+            if len(self._heap) < self.capacity:
+                heapq.heappush(self._heap, entry)
+            elif record.duration > self._heap[0][0]:
+                heapq.heapreplace(self._heap, entry)
+
+    def list(self) -> List[ProfileRecord]:
+        with self._lock:
+            return [record for _, _, record in sorted(self._heap, reverse=True)]
+
+    def get(self, profile_id: int) -> Optional[ProfileRecord]:
+        with self._lock:
+            return next((record for _, record_id, record in self._heap if record_id == profile_id), None)
+
+profile_store = ProfileStore(settings.PROFILING_KEEP)
+
+class ProfilingMiddleware:
+    """
+    Profiles a sampled fraction of requests (PROFILING_SAMPLE_RATE), plus any
+    request whose X-Debug-Profile header matches PROFILING_DEBUG_TOKEN, with
+    cProfile. Only one request is profiled at a time; everything that runs on
+    the event loop thread meanwhile is included in its profile.
+    """
+
+    def __init__(self, app, store: ProfileStore = None):
+        self.app = app
+        self.store = store or profile_store
+        self._active = threading.Lock()
+
+    def _wants_profile(self, scope) -> bool:
+        token = settings.PROFILING_DEBUG_TOKEN
+        if token:
+            for name, value in scope.get("headers", []):
+                if name == PROFILE_HEADER and hmac.compare_digest(value, token.encode()):
+                    return True
+        return settings.PROFILING_SAMPLE_RATE > 0 and random.random() < settings.PROFILING_SAMPLE_RATE
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._wants_profile(scope) or not self._active.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = self.store.next_id()
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", str(profile_id).encode())]
+            await send(message)
+
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            profiler.enable()
+            try:
+                await self.app(scope, receive, send_with_profile_id)
+            finally:
+                profiler.disable()
+        finally:
+            self._active.release()
+        duration = time.perf_counter() - start
+        try:
+            self.store.add(ProfileRecord(profile_id, scope["method"], scope["path"], duration, profiler))
+            metrics.inc("profiles_captured_total")
+        except TypeError:
+            # pstats raises TypeError when the profiler recorded nothing
+            pass
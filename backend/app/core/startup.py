@@ -0,0 +1,41 @@
+import logging
+import time
+from contextlib import contextmanager
+from typing import Dict, Any
+
+logger = logging.getLogger(__name__)
+
+class StartupTimer:
+    """Records how long each cold-start phase takes (import, settings, engine, warmup)."""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.ready_at = None
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a block and add it to the named phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    def mark_ready(self):
+        """Record the moment the app starts accepting traffic."""
+        self.ready_at = time.perf_counter()
+        logger.info(f"Startup report: {self.report()}")
+
+    def report(self) -> Dict[str, Any]:
+        """Phase breakdown in milliseconds."""
+        report = {
+            "phases_ms": {name: round(elapsed * 1000, 1) for name, elapsed in self.phases.items()},
+            "time_to_ready_ms": None
+        }
+        if self.ready_at is not None:
+            report["time_to_ready_ms"] = round((self.ready_at - self.started_at) * 1000, 1)
+        return report
+
+startup_timer = StartupTimer()
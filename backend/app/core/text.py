@@ -0,0 +1,7 @@
+import re
+
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_term(term: str) -> str:
+    """Normalize a skill, interest or industry name for matching and lookups."""
+    return _WHITESPACE.sub(" ", term).strip().lower()
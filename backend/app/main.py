@@ -1,7 +1,31 @@
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from app.core.config import settings
-from app.api.api_v1.api import api_router
+from app.core.startup import startup_timer
+from app.core.metrics import metrics
+
+import asyncio
+import logging
+
+with startup_timer.phase("import"):
+    from fastapi import FastAPI
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.responses import PlainTextResponse
+
+with startup_timer.phase("settings"):
+    from app.core.config import settings
+
+with startup_timer.phase("engine"):
+    from app.core.database import engine, read_engine
+
+with startup_timer.phase("import"):
+    from app.api.api_v1.api import api_router
+    from app.core.admission import AdmissionControlMiddleware, create_admission_controller
+    from app.core.profiling import ProfilingMiddleware
+    from app.services.ai_service import get_embedding_service, get_vector_db, get_vector_search
+    from app.services.indexing_service import indexing_worker
+    from app.services.learning_catalog import get_learning_catalog
+    from app.services.skill_index import get_skill_index
+    from app.services.facet_index import get_facet_index, facet_refresher
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -10,6 +34,14 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_STR}/openapi.json"
 )
 
+# Profile sampled or debug-flagged requests; innermost so shed requests are never profiled
+if settings.PROFILING_SAMPLE_RATE > 0 or settings.PROFILING_DEBUG_TOKEN:
+    app.add_middleware(ProfilingMiddleware)
+
+# Shed expensive requests early under load; added first so CORS headers still wrap 429/503s
+if settings.ADMISSION_CONTROL_ENABLED:
+    app.add_middleware(AdmissionControlMiddleware, controller=create_admission_controller())
+
 # Set up CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -22,6 +54,43 @@ app.add_middleware(
 # Include API routes
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+def warm_up():
+    """Open database connections, initialise provider clients and load in-memory indexes."""
+    with startup_timer.phase("warmup"):
+        try:
+            with engine.connect():
+                pass
+            if read_engine is not engine:
+                with read_engine.connect():
+                    pass
+        except Exception as e:
+            logger.warning(f"Database warmup failed: {e}")
+        for initialise in (
+            get_embedding_service, get_vector_db, get_vector_search,
+            get_learning_catalog, get_skill_index, get_facet_index
+        ):
+            try:
+                initialise()
+            except Exception as e:
+                logger.warning(f"Warmup of {initialise.__name__} failed: {e}")
+
+@app.on_event("startup")
+async def startup():
+    if settings.STARTUP_MODE == "fast":
+        # Serve immediately; providers finish initialising in the background
+        asyncio.get_running_loop().run_in_executor(None, warm_up)
+    else:
+        await asyncio.get_running_loop().run_in_executor(None, warm_up)
+    if settings.INDEXING_WORKER_ENABLED:
+        indexing_worker.start()
+    facet_refresher.start()
+    startup_timer.mark_ready()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await indexing_worker.stop()
+    await facet_refresher.stop()
+
 @app.get("/")
 async def root():
     return {"message": "Career Advisor API is running!", "version": "1.0.0"}
@@ -29,3 +98,11 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+@app.get("/health/startup")
+async def startup_report():
+    return startup_timer.report()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    return metrics.render()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Float, DateTime, JSON
+from sqlalchemy import Column, Integer, String, Text, Float, DateTime, JSON, LargeBinary, UniqueConstraint, ForeignKey, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 
@@ -17,9 +17,55 @@ class JobRole(Base):
     location = Column(String, nullable=True)
     industry = Column(String, nullable=False)
     embedding_id = Column(String, nullable=True)  # Pinecone vector ID
+    embedding_fingerprint = Column(String(64), nullable=True)  # SHA-256 of the embedded text
+    embedding_model = Column(String, nullable=True)  # Model that produced the stored vector
+    indexing_status = Column(String, nullable=False, default="pending", server_default="pending", index=True)  # pending, indexed, failed
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+class Skill(Base):
+    __tablename__ = "skills"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False)  # Display name as first seen
+    normalized_name = Column(String, unique=True, index=True, nullable=False)
+
+class JobSkill(Base):
+    __tablename__ = "job_skills"
+    __table_args__ = (Index("ix_job_skills_skill_id_job_role_id", "skill_id", "job_role_id"),)
+    
+    job_role_id = Column(Integer, ForeignKey("job_roles.id", ondelete="CASCADE"), primary_key=True)
+    skill_id = Column(Integer, ForeignKey("skills.id", ondelete="CASCADE"), primary_key=True)
+
+class JobIndexOutbox(Base):
+    __tablename__ = "job_index_outbox"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    job_role_id = Column(Integer, index=True, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    available_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)  # Not claimable before this time
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class JobNeighbor(Base):
+    __tablename__ = "job_neighbors"
+    
+    job_role_id = Column(Integer, primary_key=True)
+    rank = Column(Integer, primary_key=True)  # 0 = most similar
+    neighbor_id = Column(Integer, nullable=False, index=True)
+    similarity_score = Column(Float, nullable=False)
+
+class TermEmbedding(Base):
+    __tablename__ = "term_embeddings"
+    __table_args__ = (UniqueConstraint("kind", "term", "model", name="uq_term_embeddings_kind_term_model"),)
+    
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)  # skill, interest, industry, experience_level
+    term = Column(String, nullable=False)  # Normalized term
+    model = Column(String, nullable=False)
+    vector = Column(LargeBinary, nullable=False)  # float32 bytes
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
 class UserProfile(Base):
     __tablename__ = "user_profiles"
     
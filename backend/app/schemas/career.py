@@ -51,6 +51,7 @@ class JobRoleCreate(JobRoleBase):
 class JobRole(JobRoleBase):
     id: int
     embedding_id: Optional[str] = None
+    indexing_status: Optional[str] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
     
@@ -79,25 +80,28 @@ class SkillAnalysisRequest(BaseModel):
     experience_level: str = "entry"
     preferred_industries: Optional[List[str]] = []
 
+class LearningResource(BaseModel):
+    id: str
+    skill: str
+    title: str
+    type: str  # course, certification, book, etc.
+    provider: str
+    url: Optional[str] = None
+    duration: Optional[str] = None
+    difficulty: str
+
 class CareerMatchResponse(BaseModel):
     job_role: JobRole
     similarity_score: float
     skill_gaps: List[str]
-    recommended_learning: List[Dict[str, Any]]
+    recommended_learning: List[Dict[str, Any]]  # [{"skill": ..., "resource_ids": [...]}]
     career_progression: List[str]
 
 class SkillAnalysisResponse(BaseModel):
     matches: List[CareerMatchResponse]
     total_matches: int
     analysis_summary: str
-
-class LearningResource(BaseModel):
-    title: str
-    type: str  # course, certification, book, etc.
-    provider: str
-    url: Optional[str] = None
-    duration: Optional[str] = None
-    difficulty: str
+    learning_resources: Dict[str, LearningResource] = {}  # Resources referenced by the matches, by ID
 
 class SkillGapAnalysis(BaseModel):
     skill: str
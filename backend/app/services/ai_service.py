@@ -1,15 +1,22 @@
 import os
-import numpy as np
-from typing import List, Dict, Any, Optional
-from google.cloud import aiplatform
-import openai
-import pinecone
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, Tuple
 from app.core.config import settings
 import logging
 
+# Provider SDKs (google-cloud-aiplatform, openai, pinecone) are imported inside
+# the services that use them, so processes only pay for the providers they select.
+
 logger = logging.getLogger(__name__)
 
 class EmbeddingService:
+    GOOGLE_MODEL = "textembedding-gecko@001"
+    OPENAI_MODEL = "text-embedding-ada-002"
+    
+    # Maximum number of texts per provider embedding request
+    GOOGLE_BATCH_LIMIT = 5
+    OPENAI_BATCH_LIMIT = 2048
+    
     def __init__(self):
         self.use_google_cloud = bool(settings.GOOGLE_CLOUD_PROJECT)
         self.use_openai_backup = bool(settings.OPENAI_API_KEY)
@@ -17,6 +24,8 @@ class EmbeddingService:
         # Initialize Google Cloud Vertex AI
         if self.use_google_cloud:
             try:
+                from google.cloud import aiplatform
+
                 aiplatform.init(
                     project=settings.GOOGLE_CLOUD_PROJECT,
                     location="us-central1"
@@ -28,6 +37,8 @@ class EmbeddingService:
         
         # Initialize OpenAI as backup
         if self.use_openai_backup:
+            import openai
+
             openai.api_key = settings.OPENAI_API_KEY
             logger.info("OpenAI initialized as backup")
     
@@ -52,28 +63,78 @@ class EmbeddingService:
         """Get embedding from Google Cloud Vertex AI."""
         from vertexai.language_models import TextEmbeddingModel
         
-        model = TextEmbeddingModel.from_pretrained("textembedding-gecko@001")
+        model = TextEmbeddingModel.from_pretrained(self.GOOGLE_MODEL)
         embeddings = model.get_embeddings([text])
         return embeddings[0].values
     
     async def _get_openai_embedding(self, text: str) -> List[float]:
         """Get embedding from OpenAI."""
+        import openai
+
         response = await openai.embeddings.create(
-            model="text-embedding-ada-002",
+            model=self.OPENAI_MODEL,
             input=text
         )
         return response.data[0].embedding
 
+    @property
+    def model_id(self) -> str:
+        """Identifier of the model used for new embeddings, stored alongside each vector."""
+        if self.use_google_cloud:
+            return f"vertexai/{self.GOOGLE_MODEL}"
+        return f"openai/{self.OPENAI_MODEL}"
+    
     async def get_batch_embeddings(self, texts: List[str]) -> List[List[float]]:
-        """Get embeddings for multiple texts."""
+        """Get embeddings for multiple texts with one provider call per chunk."""
+        embeddings, _ = await self.get_batch_embeddings_with_model(texts)
+        return embeddings
+    
+    async def get_batch_embeddings_with_model(self, texts: List[str]) -> Tuple[List[List[float]], str]:
+        """Get batch embeddings plus the ID of the model that actually produced them."""
+        if not texts:
+            return [], self.model_id
+        try:
+            if self.use_google_cloud:
+                return await self._get_google_batch_embeddings(texts), f"vertexai/{self.GOOGLE_MODEL}"
+            elif self.use_openai_backup:
+                return await self._get_openai_batch_embeddings(texts), f"openai/{self.OPENAI_MODEL}"
+            else:
+                raise Exception("No embedding service configured")
+        except Exception as e:
+            logger.error(f"Error getting batch embeddings: {e}")
+            if self.use_google_cloud and self.use_openai_backup:
+                logger.info("Falling back to OpenAI")
+                return await self._get_openai_batch_embeddings(texts), f"openai/{self.OPENAI_MODEL}"
+            raise e
+    
+    async def _get_google_batch_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Get embeddings from Google Cloud Vertex AI, chunked to the per-request limit."""
+        from vertexai.language_models import TextEmbeddingModel
+        
+        model = TextEmbeddingModel.from_pretrained(self.GOOGLE_MODEL)
+        embeddings = []
+        for start in range(0, len(texts), self.GOOGLE_BATCH_LIMIT):
+            chunk = texts[start:start + self.GOOGLE_BATCH_LIMIT]
+            embeddings.extend(embedding.values for embedding in model.get_embeddings(chunk))
+        return embeddings
+    
+    async def _get_openai_batch_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Get embeddings from OpenAI, chunked to the per-request limit."""
+        import openai
+        
         embeddings = []
-        for text in texts:
-            embedding = await self.get_embedding(text)
-            embeddings.append(embedding)
+        for start in range(0, len(texts), self.OPENAI_BATCH_LIMIT):
+            response = await openai.embeddings.create(
+                model=self.OPENAI_MODEL,
+                input=texts[start:start + self.OPENAI_BATCH_LIMIT]
+            )
+            embeddings.extend(item.embedding for item in sorted(response.data, key=lambda item: item.index))
         return embeddings
 
 class VectorDatabaseService:
     def __init__(self):
+        import pinecone
+
         self.pc = pinecone.Pinecone(api_key=settings.PINECONE_API_KEY)
         self.index_name = settings.PINECONE_INDEX_NAME
         
@@ -90,6 +151,14 @@ class VectorDatabaseService:
             )
             self.index = self.pc.Index(self.index_name)
     
+    def acquire_writer(self) -> bool:
+        """Pinecone accepts writes from any process."""
+        return True
+    
+    def after_persist(self, callback):
+        """Pinecone writes are durable once acknowledged, so `callback` runs right away."""
+        callback()
+    
     async def upsert_job_embedding(self, job_id: str, embedding: List[float], metadata: Dict[str, Any]):
         """Store job embedding in Pinecone."""
         try:
@@ -99,6 +168,16 @@ class VectorDatabaseService:
             logger.error(f"Error upserting job embedding: {e}")
             raise e
     
+    async def upsert_job_embeddings(self, items: List[Tuple[str, List[float], Dict[str, Any]]], batch_size: int = 100):
+        """Store many job embeddings in Pinecone, batch_size vectors per request."""
+        try:
+            for start in range(0, len(items), batch_size):
+                self.index.upsert(items[start:start + batch_size])
+            logger.info(f"Upserted {len(items)} job embeddings")
+        except Exception as e:
+            logger.error(f"Error upserting job embeddings: {e}")
+            raise e
+    
     async def search_similar_jobs(self, query_embedding: List[float], top_k: int = 10, filters: Optional[Dict] = None) -> List[Dict]:
         """Search for similar job roles."""
         try:
@@ -122,6 +201,40 @@ class VectorDatabaseService:
             logger.error(f"Error searching similar jobs: {e}")
             raise e
     
+    async def fetch_job_embeddings(self, job_ids: List[str], batch_size: int = 100) -> Dict[str, List[float]]:
+        """Fetch stored vectors by job ID."""
+        try:
+            embeddings = {}
+            for start in range(0, len(job_ids), batch_size):
+                response = self.index.fetch(ids=job_ids[start:start + batch_size])
+                for vector_id, vector in response.vectors.items():
+                    embeddings[vector_id] = vector.values
+            return embeddings
+        except Exception as e:
+            logger.error(f"Error fetching job embeddings: {e}")
+            raise e
+    
+    async def list_job_ids(self) -> List[str]:
+        """List every vector ID in the index (paginated on the Pinecone side)."""
+        try:
+            job_ids = []
+            for page in self.index.list():
+                job_ids.extend(page)
+            return job_ids
+        except Exception as e:
+            logger.error(f"Error listing job embeddings: {e}")
+            raise e
+    
+    async def delete_job_embeddings(self, job_ids: List[str], batch_size: int = 1000):
+        """Delete many job embeddings from Pinecone."""
+        try:
+            for start in range(0, len(job_ids), batch_size):
+                self.index.delete(ids=job_ids[start:start + batch_size])
+            logger.info(f"Deleted {len(job_ids)} job embeddings")
+        except Exception as e:
+            logger.error(f"Error deleting job embeddings: {e}")
+            raise e
+    
     async def delete_job_embedding(self, job_id: str):
         """Delete job embedding from Pinecone."""
         try:
@@ -130,3 +243,31 @@ class VectorDatabaseService:
         except Exception as e:
             logger.error(f"Error deleting job embedding: {e}")
             raise e
+
+
+@lru_cache()
+def get_embedding_service() -> EmbeddingService:
+    """Process-wide EmbeddingService, created on first use."""
+    return EmbeddingService()
+
+@lru_cache()
+def get_vector_db() -> VectorDatabaseService:
+    """
+    Process-wide vector store, created on first use: Pinecone, or the local
+    HNSW index when VECTOR_SEARCH_BACKEND is "hnsw".
+    """
+    if settings.VECTOR_SEARCH_BACKEND == "hnsw":
+        from app.services.hnsw_index import HnswVectorStore
+        return HnswVectorStore()
+    return VectorDatabaseService()
+
+@lru_cache()
+def get_vector_search():
+    """
+    Search backend selected by VECTOR_SEARCH_BACKEND. Writes always go to
+    get_vector_db(); this only decides where similarity queries are answered.
+    """
+    if settings.VECTOR_SEARCH_BACKEND == "snapshot":
+        from app.services.index_snapshot import SnapshotVectorSearch
+        return SnapshotVectorSearch()
+    return get_vector_db()
@@ -0,0 +1,287 @@
+import asyncio
+import csv
+import json
+import logging
+from typing import List, Dict, Any, Tuple, Optional, Set, AsyncIterator
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.models.database import JobRole
+from app.schemas.career import JobRoleCreate
+from app.services.indexing_service import INDEXING_PENDING, enqueue_job_indexing
+from app.services.job_indexes import index_added_jobs, load_job_indexes
+from app.services.job_skills import link_job_skills
+
+logger = logging.getLogger(__name__)
+
+FORMAT_NDJSON = "ndjson"
+FORMAT_CSV = "csv"
+
+CONTENT_TYPE_FORMATS = {
+    "application/x-ndjson": FORMAT_NDJSON,
+    "application/jsonl": FORMAT_NDJSON,
+    "application/json-lines": FORMAT_NDJSON,
+    "text/csv": FORMAT_CSV,
+}
+
+# Rows parsed per hand-off from the CSV worker thread
+CSV_PARSE_CHUNK_ROWS = 500
+
+# A field can be as long as a whole record; csv's default limit is 128 KiB
+csv.field_size_limit(max(csv.field_size_limit(), settings.BULK_IMPORT_MAX_LINE_BYTES))
+
+# CSV column names accepted in place of JobRoleCreate fields (sample_jobs.csv uses job_title)
+CSV_COLUMN_ALIASES = {"job_title": "title"}
+
+# (line number, parsed row or None, error or None)
+ParsedRow = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+class BulkImportError(Exception):
+    """The upload cannot be read any further (e.g. an unterminated line over the size limit)."""
+
+def format_for_content_type(content_type: str) -> Optional[str]:
+    return CONTENT_TYPE_FORMATS.get(content_type.split(";")[0].strip().lower())
+
+async def iter_lines(chunks: AsyncIterator[bytes], max_line_bytes: int = None) -> AsyncIterator[Tuple[int, bytes]]:
+    """Split a byte stream into numbered lines, holding at most one partial line in memory."""
+    max_line_bytes = max_line_bytes or settings.BULK_IMPORT_MAX_LINE_BYTES
+    buffer = bytearray()
+    line_no = 0
+    async for chunk in chunks:
+        buffer += chunk
+        start = 0
+        while True:
+            end = buffer.find(b"\n", start)
+            if end == -1:
+                break
+            line_no += 1
+            yield line_no, bytes(buffer[start:end]).rstrip(b"\r")
+            start = end + 1
+        del buffer[:start]
+        if len(buffer) > max_line_bytes:
+            raise BulkImportError(f"Line {line_no + 1} exceeds {max_line_bytes} bytes")
+    if buffer.strip():
+        yield line_no + 1, bytes(buffer).rstrip(b"\r")
+
+async def iter_ndjson_rows(lines: AsyncIterator[Tuple[int, bytes]]) -> AsyncIterator[ParsedRow]:
+    async for line_no, line in lines:
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield line_no, None, f"Invalid JSON: {str(e)}"
+            continue
+        if not isinstance(row, dict):
+            yield line_no, None, "Expected a JSON object"
+            continue
+        yield line_no, row, None
+
+def _csv_row_to_job(header: List[str], fields: List[str]) -> Dict[str, Any]:
+    row = {
+        CSV_COLUMN_ALIASES.get(column, column): (value.strip() or None)
+        for column, value in zip(header, fields)
+    }
+    if isinstance(row.get("required_skills"), str):
+        row["required_skills"] = [skill.strip() for skill in row["required_skills"].split(",") if skill.strip()]
+    return row
+
+class _CsvRowReader:
+    """
+    One csv.reader over the whole upload, run on a worker thread. The reader
+    pulls decoded lines from the async line iterator on the event loop, so
+    quoted fields may span lines and stray quotes inside unquoted fields
+    (`15" screen`) are parsed as csv itself parses them.
+    """
+
+    def __init__(self, lines: AsyncIterator[Tuple[int, bytes]], loop: asyncio.AbstractEventLoop, max_record_bytes: int):
+        self._lines = lines.__aiter__()
+        self._loop = loop
+        self._reader = csv.reader(self, strict=True)
+        self.max_record_bytes = max_record_bytes
+        self.header: Optional[List[str]] = None
+        self.bad_lines: Set[int] = set()
+        self.record_line = 1
+        self.record_bytes = 0
+        self.finished = False
+        self.error: Optional[BulkImportError] = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        try:
+            line_no, line = asyncio.run_coroutine_threadsafe(self._lines.__anext__(), self._loop).result()
+        except StopAsyncIteration:
+            raise StopIteration
+        self.record_bytes += len(line) + 1
+        if self.record_bytes > self.max_record_bytes:
+            raise BulkImportError(f"Record starting on line {self.record_line} exceeds {self.max_record_bytes} bytes")
+        try:
+            text = line.decode("utf-8-sig" if line_no == 1 else "utf-8")
+        except UnicodeDecodeError:
+            # Keep feeding the reader so line numbers stay in step; the record is reported below
+            self.bad_lines.add(line_no)
+            text = line.decode("utf-8", errors="replace")
+        return text + "\n"
+
+    def read_rows(self, limit: int) -> List[ParsedRow]:
+        """Parse up to `limit` rows; sets `finished` at the end of the upload and `error` if it is unreadable."""
+        rows = []
+        try:
+            while len(rows) < limit:
+                self.record_line, self.record_bytes = self._reader.line_num + 1, 0
+                try:
+                    fields = next(self._reader)
+                except StopIteration:
+                    self.finished = True
+                    return rows
+                except csv.Error as e:
+                    rows.append((self.record_line, None, f"Invalid CSV: {str(e)}"))
+                    continue
+                row = self._parse_record(fields)
+                if row is not None:
+                    rows.append(row)
+        except BulkImportError as e:
+            self.finished, self.error = True, e
+        return rows
+
+    def _parse_record(self, fields: List[str]) -> Optional[ParsedRow]:
+        bad_lines = sorted(n for n in self.bad_lines if n <= self._reader.line_num)
+        if bad_lines:
+            self.bad_lines.difference_update(bad_lines)
+            return self.record_line, None, f"Invalid UTF-8 on line {bad_lines[0]}"
+        if not any(field.strip() for field in fields):
+            return None
+        if self.header is None:
+            self.header = [column.strip() for column in fields]
+            return None
+        if len(fields) != len(self.header):
+            return self.record_line, None, f"Expected {len(self.header)} columns, got {len(fields)}"
+        return self.record_line, _csv_row_to_job(self.header, fields), None
+
+async def iter_csv_rows(lines: AsyncIterator[Tuple[int, bytes]], max_line_bytes: int = None) -> AsyncIterator[ParsedRow]:
+    """
+    Parse CSV with a header row. Records, including quoted fields spanning
+    lines, are limited to `max_line_bytes`; rows are parsed in chunks on a
+    worker thread.
+    """
+    loop = asyncio.get_running_loop()
+    reader = _CsvRowReader(lines, loop, max_line_bytes or settings.BULK_IMPORT_MAX_LINE_BYTES)
+    while not reader.finished:
+        for row in await loop.run_in_executor(None, reader.read_rows, CSV_PARSE_CHUNK_ROWS):
+            yield row
+    if reader.error is not None:
+        raise reader.error
+
+def parse_rows(chunks: AsyncIterator[bytes], data_format: str) -> AsyncIterator[ParsedRow]:
+    lines = iter_lines(chunks)
+    if data_format == FORMAT_CSV:
+        return iter_csv_rows(lines)
+    return iter_ndjson_rows(lines)
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in error.errors()
+    )
+
+class BulkImportResult:
+    """Row counts plus the first `max_errors` failures, so the summary stays small for any upload size."""
+
+    def __init__(self, max_errors: int):
+        self.max_errors = max_errors
+        self.received = 0
+        self.created = 0
+        self.failed = 0
+        self.errors: List[Dict[str, Any]] = []
+        self.aborted: Optional[str] = None
+
+    def fail(self, line: int, error: str):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line, "error": error})
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "received": self.received,
+            "created": self.created,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+            "aborted": self.aborted
+        }
+
+def _insert_batch(db: Session, batch: List[Tuple[int, JobRoleCreate]], result: BulkImportResult) -> List[JobRole]:
+    """
+    Insert one batch in a single transaction, with its job_skills and outbox
+    rows. Runs on a worker thread; returns the inserted jobs (none on failure).
+    """
+    try:
+        values = [dict(job.dict(), indexing_status=INDEXING_PENDING) for _, job in batch]
+        job_ids = db.scalars(insert(JobRole).returning(JobRole.id, sort_by_parameter_order=True), values).all()
+        # Transient copies for the job_skills rows and in-memory indexes; never added to the session
+        jobs = [JobRole(id=job_id, **job_values) for job_id, job_values in zip(job_ids, values)]
+        link_job_skills(db, jobs)
+        enqueue_job_indexing(db, job_ids)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Bulk import batch starting on line {batch[0][0]} failed: {e}")
+        for line, _ in batch:
+            result.fail(line, f"Error creating job: {str(e)}")
+        return []
+
+    result.created += len(jobs)
+    metrics.inc("bulk_import_rows_created_total", len(jobs))
+    return jobs
+
+async def import_jobs(
+    db: Session,
+    rows: AsyncIterator[ParsedRow],
+    batch_size: int = None,
+    max_errors: int = None
+) -> Dict[str, Any]:
+    """
+    Validate rows against JobRoleCreate as they arrive and insert them in
+    batches of `batch_size`, committing each batch. Database work runs on a
+    worker thread so other requests keep being served; the in-memory indexes
+    are updated back on the event loop. Embedding is left to the indexing
+    worker, which embeds and upserts the queued jobs in its own batches.
+    Returns counts and the failed rows by line number.
+    """
+    batch_size = batch_size or settings.BULK_IMPORT_BATCH_SIZE
+    result = BulkImportResult(settings.BULK_IMPORT_MAX_ERRORS if max_errors is None else max_errors)
+    batch: List[Tuple[int, JobRoleCreate]] = []
+    loop = asyncio.get_running_loop()
+    indexes = await loop.run_in_executor(None, load_job_indexes)
+
+    async def insert_batch(batch: List[Tuple[int, JobRoleCreate]]):
+        jobs = await loop.run_in_executor(None, _insert_batch, db, batch, result)
+        index_added_jobs(indexes, jobs)
+
+    try:
+        async for line, data, error in rows:
+            result.received += 1
+            if error is not None:
+                result.fail(line, error)
+                continue
+            try:
+                batch.append((line, JobRoleCreate(**data)))
+            except ValidationError as e:
+                result.fail(line, _validation_message(e))
+                continue
+            if len(batch) >= batch_size:
+                await insert_batch(batch)
+                batch = []
+    except BulkImportError as e:
+        # Rows before the unreadable part are still imported
+        result.aborted = str(e)
+
+    if batch:
+        await insert_batch(batch)
+
+    metrics.inc("bulk_import_rows_failed_total", result.failed)
+    logger.info(f"Bulk import: {result.created} created, {result.failed} failed")
+    return result.summary()
@@ -1,16 +1,27 @@
 import logging
 from typing import List, Dict, Any
 from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.text import normalize_term
 from app.models.database import JobRole, UserProfile, CareerRecommendation
-from app.services.ai_service import EmbeddingService, VectorDatabaseService
+from app.services.ai_service import get_embedding_service, get_vector_search
 from app.schemas.career import SkillAnalysisRequest, CareerMatchResponse, SkillAnalysisResponse
+from app.services.learning_catalog import get_learning_catalog
+from app.services.profile_embedding import get_profile_embedding_service
 
 logger = logging.getLogger(__name__)
 
+def load_jobs_by_id(db: Session, job_ids: List[int]) -> Dict[int, JobRole]:
+    """Hydrate vector search hits with a single IN query."""
+    if not job_ids:
+        return {}
+    return {job.id: job for job in db.query(JobRole).filter(JobRole.id.in_(job_ids))}
+
 class CareerAdvisorService:
     def __init__(self):
-        self.embedding_service = EmbeddingService()
-        self.vector_db = VectorDatabaseService()
+        self.embedding_service = get_embedding_service()
+        self.vector_db = get_vector_search()
+        self.learning_catalog = get_learning_catalog()
     
     async def analyze_skills_and_recommend_careers(
         self, 
@@ -20,11 +31,8 @@ class CareerAdvisorService:
     ) -> SkillAnalysisResponse:
         """Main function to analyze user skills and recommend careers."""
         
-        # Create user profile text for embedding
-        user_text = self._create_user_profile_text(request)
-        
         # Get embedding for user profile
-        user_embedding = await self.embedding_service.get_embedding(user_text)
+        user_embedding = await self._get_user_embedding(request, db)
         
         # Search for similar jobs in vector database
         filters = self._build_search_filters(request)
@@ -34,18 +42,19 @@ class CareerAdvisorService:
             filters=filters
         )
         
-        # Get job details from database
+        # Get job details from database in one query
+        jobs_by_id = load_jobs_by_id(db, [int(job_match['job_id']) for job_match in similar_jobs])
         matches = []
+        resource_ids_by_skill = {}  # Shared across matches so each gap is resolved and returned once
         for job_match in similar_jobs:
-            job_id = int(job_match['job_id'])
-            job_role = db.query(JobRole).filter(JobRole.id == job_id).first()
+            job_role = jobs_by_id.get(int(job_match['job_id']))
             
             if job_role:
                 # Analyze skill gaps
                 skill_gaps = self._analyze_skill_gaps(request.skills, job_role.required_skills)
                 
                 # Get learning recommendations
-                learning_recs = await self._get_learning_recommendations(skill_gaps, job_role)
+                learning_recs = self._get_learning_recommendations(skill_gaps, request.experience_level, resource_ids_by_skill)
                 
                 # Get career progression path
                 career_progression = self._get_career_progression(job_role)
@@ -65,9 +74,23 @@ class CareerAdvisorService:
         return SkillAnalysisResponse(
             matches=matches,
             total_matches=len(matches),
-            analysis_summary=analysis_summary
+            analysis_summary=analysis_summary,
+            learning_resources={
+                resource_id: self.learning_catalog.get(resource_id)
+                for resource_ids in resource_ids_by_skill.values() for resource_id in resource_ids
+            }
         )
     
+    async def _get_user_embedding(self, request: SkillAnalysisRequest, db: Session) -> List[float]:
+        """Compose the user profile from cached term vectors when configured, else embed it as full text."""
+        if settings.PROFILE_EMBEDDING_MODE == "compositional":
+            embedding = await get_profile_embedding_service().embed_profile(request, db)
+            if embedding is not None:
+                return embedding
+        
+        user_text = self._create_user_profile_text(request)
+        return await self.embedding_service.get_embedding(user_text)
+    
     def _create_user_profile_text(self, request: SkillAnalysisRequest) -> str:
         """Create a text representation of user profile for embedding."""
         text_parts = [
@@ -117,33 +140,19 @@ class CareerAdvisorService:
         
         return skill_gaps
     
-    async def _get_learning_recommendations(self, skill_gaps: List[str], job_role: JobRole) -> List[Dict[str, Any]]:
-        """Get learning recommendations for skill gaps."""
+    def _get_learning_recommendations(
+        self,
+        skill_gaps: List[str],
+        experience_level: str,
+        resolved: Dict[str, List[str]]
+    ) -> List[Dict[str, Any]]:
+        """Reference catalog resources for each skill gap, resolving each skill once per request."""
         recommendations = []
-        
-        # This is a simplified version - in production, you'd use a more sophisticated
-        # system to recommend actual courses, certifications, etc.
         for skill in skill_gaps:
-            rec = {
-                "skill": skill,
-                "resources": [
-                    {
-                        "title": f"Learn {skill} - Online Course",
-                        "type": "course",
-                        "provider": "Various Platforms",
-                        "duration": "4-8 weeks",
-                        "difficulty": "beginner"
-                    },
-                    {
-                        "title": f"{skill} Certification",
-                        "type": "certification",
-                        "provider": "Industry Standard",
-                        "duration": "2-3 months",
-                        "difficulty": "intermediate"
-                    }
-                ]
-            }
-            recommendations.append(rec)
+            key = normalize_term(skill)
+            if key not in resolved:
+                resolved[key] = self.learning_catalog.resource_ids_for(skill, experience_level)
+            recommendations.append({"skill": skill, "resource_ids": resolved[key]})
         
         return recommendations
     
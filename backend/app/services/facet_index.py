@@ -0,0 +1,188 @@
+import asyncio
+import logging
+from typing import Dict, Iterable, List, Optional, Set, Any
+from app.core.config import settings
+from app.core.database import ReadSessionLocal
+from app.core.text import normalize_term
+from app.models.database import JobRole
+from app.services.job_skills import SKILLS_MATCH_ALL, SKILLS_MATCH_ANY
+from app.services.skill_index import refresh_skill_index
+
+logger = logging.getLogger(__name__)
+
+FACET_FIELDS = ("industry", "experience_level", "location")
+
+class FacetIndex:
+    """
+    Job ID sets per facet value and per normalized required skill. Counts for
+    a filter combination are the sizes of set intersections, so rendering
+    filters never runs GROUP BY queries.
+    """
+
+    def __init__(self):
+        self._ids: Dict[str, Dict[Any, Set[int]]] = {field: {} for field in FACET_FIELDS}
+        self._all: Set[int] = set()
+        self._values: Dict[int, Dict[str, Any]] = {}
+        self._skill_ids: Dict[str, Set[int]] = {}
+        self._skills: Dict[int, Set[str]] = {}
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self._all)
+
+    def rebuild(self, rows):
+        """Replace the index with (job_id, {field: value}, required_skills) rows."""
+        ids: Dict[str, Dict[Any, Set[int]]] = {field: {} for field in FACET_FIELDS}
+        values = {}
+        skill_ids: Dict[str, Set[int]] = {}
+        skills = {}
+        for job_id, job_values, required_skills in rows:
+            values[job_id] = job_values
+            for field, value in job_values.items():
+                if value is not None:
+                    ids[field].setdefault(value, set()).add(job_id)
+            skills[job_id] = _skill_keys(required_skills)
+            for key in skills[job_id]:
+                skill_ids.setdefault(key, set()).add(job_id)
+        self._ids, self._values, self._all = ids, values, set(values)
+        self._skill_ids, self._skills = skill_ids, skills
+        self.loaded = True
+
+    def add_job(self, job: JobRole):
+        self.remove_job(job.id)
+        job_values = {field: getattr(job, field) for field in FACET_FIELDS}
+        self._values[job.id] = job_values
+        self._all.add(job.id)
+        for field, value in job_values.items():
+            if value is not None:
+                self._ids[field].setdefault(value, set()).add(job.id)
+        self._skills[job.id] = _skill_keys(job.required_skills)
+        for key in self._skills[job.id]:
+            self._skill_ids.setdefault(key, set()).add(job.id)
+
+    def remove_job(self, job_id: int):
+        job_values = self._values.pop(job_id, None)
+        if job_values is None:
+            return
+        self._all.discard(job_id)
+        for field, value in job_values.items():
+            ids = self._ids[field].get(value)
+            if ids is not None:
+                ids.discard(job_id)
+                if not ids:
+                    del self._ids[field][value]
+        for key in self._skills.pop(job_id, set()):
+            ids = self._skill_ids.get(key)
+            if ids is not None:
+                ids.discard(job_id)
+                if not ids:
+                    del self._skill_ids[key]
+
+    def _skill_matches(self, skills: Optional[List[str]], match: str) -> Optional[Set[int]]:
+        """Jobs requiring any / all of the skills; None means no skill filter."""
+        keys = _skill_keys(skills)
+        if not keys:
+            return None
+        sets = sorted((self._skill_ids.get(key, set()) for key in keys), key=len)
+        if match == SKILLS_MATCH_ALL:
+            return sets[0].intersection(*sets[1:])
+        return set().union(*sets)
+
+    def _matching(self, filters: Dict[str, Any], exclude: str = None, skill_matches: Set[int] = None) -> Optional[Set[int]]:
+        """Intersection of the filter sets (smallest first); None means no filter applies."""
+        sets = [
+            self._ids[field].get(value, set())
+            for field, value in filters.items() if value is not None and field != exclude
+        ]
+        if skill_matches is not None:
+            sets.append(skill_matches)
+        if not sets:
+            return None
+        sets.sort(key=len)
+        return sets[0].intersection(*sets[1:])
+
+    def counts(self, filters: Dict[str, Any], skills: List[str] = None, skills_match: str = SKILLS_MATCH_ANY) -> Dict[str, Any]:
+        """
+        Total matching jobs plus per-value counts for each facet. A facet's own
+        filter is left out of its counts so the UI can show the alternatives;
+        the skills filter applies to every facet.
+        """
+        skill_matches = self._skill_matches(skills, skills_match)
+        facets = {}
+        for field in FACET_FIELDS:
+            base = self._matching(filters, exclude=field, skill_matches=skill_matches)
+            facets[field] = {
+                value: len(ids) if base is None else len(ids & base)
+                for value, ids in self._ids[field].items()
+            }
+            facets[field] = {value: count for value, count in facets[field].items() if count}
+        matching = self._matching(filters, skill_matches=skill_matches)
+        return {
+            "total": len(self._all) if matching is None else len(matching),
+            "facets": facets
+        }
+
+def _skill_keys(skills: Optional[Iterable[str]]) -> Set[str]:
+    """Normalized skill names, matched the same way as the job_skills filter."""
+    return {normalize_term(skill) for skill in skills or [] if normalize_term(skill)}
+
+facet_index = FacetIndex()
+
+def rebuild_facet_index():
+    """Reload the facet index from the database (read replica when configured)."""
+    db = ReadSessionLocal()
+    try:
+        rows = db.query(
+            JobRole.id, JobRole.required_skills, *(getattr(JobRole, field) for field in FACET_FIELDS)
+        ).yield_per(1000)
+        facet_index.rebuild(
+            (row[0], dict(zip(FACET_FIELDS, row[2:])), row[1]) for row in rows
+        )
+    finally:
+        db.close()
+    logger.info(f"Rebuilt facet index with {len(facet_index)} jobs")
+
+def get_facet_index() -> FacetIndex:
+    """The process-wide facet index, loaded on first use."""
+    if not facet_index.loaded:
+        rebuild_facet_index()
+    return facet_index
+
+class FacetRefresher:
+    """
+    Background task that periodically rebuilds the facet index, and the skill
+    index when no snapshot supplies it, so both pick up writes made through
+    other workers and repair missed updates.
+    """
+
+    def __init__(self, interval: float = None):
+        self.interval = interval or settings.FACET_REBUILD_SECONDS
+        self._task = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(None, rebuild_facet_index)
+            except Exception as e:
+                logger.error(f"Facet index rebuild failed: {e}")
+            try:
+                await loop.run_in_executor(None, refresh_skill_index)
+            except Exception as e:
+                logger.error(f"Skill index rebuild failed: {e}")
+
+facet_refresher = FacetRefresher()
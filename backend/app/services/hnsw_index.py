@@ -0,0 +1,482 @@
+import atexit
+import fcntl
+import json
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, List, Dict, Any, Optional, Set, Tuple
+import numpy as np
+from app.core.config import settings
+from app.services.index_snapshot import (
+    FILTER_FIELDS, IndexSnapshot, read_current_version, _write_current_marker, _prune_old_versions
+)
+
+logger = logging.getLogger(__name__)
+
+# Index layout (one directory per saved version, like index snapshots):
+#   <HNSW_INDEX_DIR>/CURRENT                 name of the live version
+#   <HNSW_INDEX_DIR>/WRITER.lock             flock held by the one process allowed to write
+#   <HNSW_INDEX_DIR>/<version>/index.bin     hnswlib graph and vectors, labelled by job ID
+#   <HNSW_INDEX_DIR>/<version>/metadata.json parameters, filter attributes per job, deleted labels
+WRITER_LOCK = "WRITER.lock"
+ADD_CHUNK_SIZE = 10000
+
+# Filtered queries matching at most this many jobs are scored exactly; graph
+# search with a very selective filter visits most of the graph anyway
+EXACT_SEARCH_MAX_CANDIDATES = 1000
+
+# Broader filters (experience_level $in [...] on every analyze-skills call)
+# run one unfiltered query for FILTER_OVERSAMPLE times the expected number of
+# neighbours needed for k matches, then post-filter, as long as that is at
+# most POST_FILTER_MAX_K neighbours. Only filters in between use hnswlib's
+# per-node filter callback.
+FILTER_OVERSAMPLE = 2.0
+POST_FILTER_MAX_K = 200
+
+class _ReadWriteLock:
+    """
+    Many readers or one writer. Readers do not queue behind a waiting writer,
+    so searches on the event loop never wait for a save to finish.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writing = False
+
+    @contextmanager
+    def reading(self):
+        with self._cond:
+            while self._writing:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def writing(self):
+        with self._cond:
+            while self._writing or self._readers:
+                self._cond.wait()
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writing = False
+                self._cond.notify_all()
+
+class HnswIndex:
+    """
+    hnswlib graph over job vectors in cosine space, labelled by job ID, with an
+    inverted index over FILTER_FIELDS for filtered queries. Deletes only mark
+    labels; re-adding a deleted job reuses its slot. hnswlib's resize and
+    set_ef are not safe alongside queries, so searches, reads and saves share
+    a read lock and writes take it exclusively.
+    """
+
+    def __init__(self, index, m: int, ef_construction: int, ef_search: int,
+                 attributes: Dict[int, Dict[str, Any]] = None, deleted: Set[int] = None):
+        self.index = index
+        self.dim = index.dim
+        self.m = m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.attributes: Dict[int, Dict[str, Any]] = {}
+        self._deleted: Set[int] = set(deleted or ())
+        self._postings: Dict[str, Dict[Any, Set[int]]] = {field: {} for field in FILTER_FIELDS}
+        self._lock = _ReadWriteLock()
+        for job_id, job_attributes in (attributes or {}).items():
+            self._index_attributes(job_id, job_attributes)
+        index.set_ef(ef_search)
+
+    @classmethod
+    def create(cls, dim: int, m: int = None, ef_construction: int = None, ef_search: int = None,
+               max_elements: int = 1024) -> "HnswIndex":
+        import hnswlib
+
+        m = m or settings.HNSW_M
+        ef_construction = ef_construction or settings.HNSW_EF_CONSTRUCTION
+        index = hnswlib.Index(space="cosine", dim=dim)
+        index.init_index(max_elements=max_elements, M=m, ef_construction=ef_construction)
+        return cls(index, m, ef_construction, ef_search or settings.HNSW_EF_SEARCH)
+
+    @classmethod
+    def load(cls, path: str, ef_search: int = None) -> "HnswIndex":
+        import hnswlib
+
+        with open(os.path.join(path, "metadata.json")) as f:
+            metadata = json.load(f)
+        index = hnswlib.Index(space="cosine", dim=metadata["dim"])
+        index.load_index(os.path.join(path, "index.bin"), max_elements=metadata["max_elements"])
+        return cls(
+            index, metadata["m"], metadata["ef_construction"], ef_search or settings.HNSW_EF_SEARCH,
+            attributes={int(job_id): values for job_id, values in metadata["attributes"].items()},
+            deleted=set(metadata["deleted"])
+        )
+
+    def set_ef_search(self, ef_search: int):
+        """Change the candidate list size used by every query (hnswlib searches with at least k)."""
+        with self._lock.writing():
+            self.ef_search = ef_search
+            self.index.set_ef(ef_search)
+
+    def save(self, path: str):
+        with self._lock.reading():
+            self.index.save_index(os.path.join(path, "index.bin"))
+            metadata = {
+                "dim": self.dim,
+                "m": self.m,
+                "ef_construction": self.ef_construction,
+                "max_elements": self.index.get_max_elements(),
+                "attributes": {str(job_id): values for job_id, values in self.attributes.items()},
+                "deleted": sorted(self._deleted)
+            }
+        with open(os.path.join(path, "metadata.json"), "w") as f:
+            json.dump(metadata, f)
+
+    def __len__(self) -> int:
+        return len(self.attributes)
+
+    def __contains__(self, job_id: int) -> bool:
+        return job_id in self.attributes
+
+    def _index_attributes(self, job_id: int, job_attributes: Dict[str, Any]):
+        self.attributes[job_id] = job_attributes
+        for field in FILTER_FIELDS:
+            value = job_attributes.get(field)
+            if value is not None:
+                self._postings[field].setdefault(value, set()).add(job_id)
+
+    def _unindex_attributes(self, job_id: int):
+        job_attributes = self.attributes.pop(job_id, None)
+        if job_attributes is None:
+            return
+        for field in FILTER_FIELDS:
+            ids = self._postings[field].get(job_attributes.get(field))
+            if ids is not None:
+                ids.discard(job_id)
+                if not ids:
+                    del self._postings[field][job_attributes[field]]
+
+    def add(self, job_ids: List[int], vectors: np.ndarray, attributes: List[Dict[str, Any]]):
+        """Insert or replace jobs. Vectors need not be normalized."""
+        with self._lock.writing():
+            needed = self.index.get_current_count() + len(job_ids)
+            if needed > self.index.get_max_elements():
+                self.index.resize_index(max(needed, 2 * self.index.get_max_elements()))
+            for job_id in job_ids:
+                if job_id in self._deleted:
+                    self.index.unmark_deleted(job_id)
+                    self._deleted.discard(job_id)
+            self.index.add_items(np.asarray(vectors, dtype=np.float32), np.asarray(job_ids, dtype=np.int64))
+            for job_id, job_attributes in zip(job_ids, attributes):
+                self._unindex_attributes(job_id)
+                self._index_attributes(job_id, {field: job_attributes.get(field) for field in FILTER_FIELDS})
+
+    def delete(self, job_ids: List[int]):
+        with self._lock.writing():
+            for job_id in job_ids:
+                if job_id in self.attributes:
+                    self.index.mark_deleted(job_id)
+                    self._deleted.add(job_id)
+                    self._unindex_attributes(job_id)
+
+    def get_vectors(self, job_ids: List[int]) -> Dict[int, List[float]]:
+        """Stored (normalized) vectors for the given jobs that are in the index."""
+        with self._lock.reading():
+            present = [job_id for job_id in job_ids if job_id in self.attributes]
+            if not present:
+                return {}
+            return dict(zip(present, np.asarray(self.index.get_items(present), dtype=np.float32).tolist()))
+
+    def _conditions(self, filters: Dict) -> List[Tuple[str, Set[Any]]]:
+        """Pinecone-style equality / $in filters as (field, accepted values) pairs."""
+        conditions = []
+        for field, condition in filters.items():
+            if field not in self._postings:
+                raise ValueError(f"Unsupported HNSW filter field: {field}")
+            conditions.append((field, set(condition["$in"] if isinstance(condition, dict) else [condition])))
+        return conditions
+
+    def _matches(self, job_id: int, conditions: List[Tuple[str, Set[Any]]]) -> bool:
+        job_attributes = self.attributes.get(job_id)
+        return job_attributes is not None and all(job_attributes.get(field) in values for field, values in conditions)
+
+    def _count(self, field: str, values: Set[Any]) -> int:
+        return sum(len(self._postings[field].get(value, ())) for value in values)
+
+    def _candidates(self, conditions: List[Tuple[str, Set[Any]]]) -> Set[int]:
+        """Job IDs matching every condition, built from the smallest field's postings."""
+        field, values = min(conditions, key=lambda condition: self._count(*condition))
+        return {
+            job_id
+            for value in values for job_id in self._postings[field].get(value, ())
+            if self._matches(job_id, conditions)
+        }
+
+    def _match(self, job_id: int, score: float) -> Dict:
+        return {'job_id': str(job_id), 'similarity_score': score, 'metadata': dict(self.attributes[job_id])}
+
+    def search(self, query_embedding: List[float], top_k: int = 10, filters: Optional[Dict] = None) -> List[Dict]:
+        """Approximate cosine search, returning matches shaped like Pinecone's."""
+        with self._lock.reading():
+            return self._search(query_embedding, top_k, filters)
+
+    def _search(self, query_embedding: List[float], top_k: int, filters: Optional[Dict]) -> List[Dict]:
+        query = np.asarray(query_embedding, dtype=np.float32).reshape(1, -1)
+        if not filters:
+            return self._graph_search(query, min(top_k, len(self)))
+
+        conditions = self._conditions(filters)
+        counts = [self._count(field, values) for field, values in conditions]
+        if min(counts) > EXACT_SEARCH_MAX_CANDIDATES:
+            matches = self._post_filtered_search(query, top_k, conditions, counts)
+            if matches is not None:
+                return matches
+
+        candidates = self._candidates(conditions)
+        if not candidates:
+            return []
+        if len(candidates) <= EXACT_SEARCH_MAX_CANDIDATES:
+            return self._exact_search(query[0], list(candidates), min(top_k, len(candidates)))
+        return self._graph_search(query, top_k, candidates)
+
+    def _post_filtered_search(self, query: np.ndarray, top_k: int, conditions: List[Tuple[str, Set[Any]]],
+                              counts: List[int]) -> Optional[List[Dict]]:
+        """Unfiltered query for enough neighbours to hold top_k matches; None if the filter is too narrow or they don't."""
+        # Share of the index expected to match, assuming independent fields
+        share = math.prod(count / len(self) for count in counts)
+        oversampled = min(math.ceil(top_k * FILTER_OVERSAMPLE / share), len(self))
+        if oversampled > POST_FILTER_MAX_K:
+            return None
+        try:
+            labels, distances = self.index.knn_query(query, k=oversampled, num_threads=1)
+        except RuntimeError:
+            return None
+        matches = [
+            self._match(int(label), 1.0 - float(distance))
+            for label, distance in zip(labels[0], distances[0]) if self._matches(int(label), conditions)
+        ]
+        return matches[:top_k] if len(matches) >= top_k else None
+
+    def _graph_search(self, query: np.ndarray, k: int, candidates: Set[int] = None) -> List[Dict]:
+        if k <= 0:
+            return []
+        try:
+            labels, distances = self.index.knn_query(
+                query, k=k, num_threads=1, filter=None if candidates is None else candidates.__contains__
+            )
+        except RuntimeError:
+            # The graph could not reach k live matches (heavy deletes or a narrow filter)
+            return self._exact_search(query[0], list(candidates if candidates is not None else self.attributes), k)
+        return [self._match(int(label), 1.0 - float(distance)) for label, distance in zip(labels[0], distances[0])]
+
+    def _exact_search(self, query: np.ndarray, job_ids: List[int], k: int) -> List[Dict]:
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+        scores = np.asarray(self.index.get_items(job_ids), dtype=np.float32) @ query
+        top = np.argsort(-scores)[:k]
+        return [self._match(job_ids[position], float(scores[position])) for position in top]
+
+def build_from_snapshot(snapshot: IndexSnapshot, m: int = None, ef_construction: int = None,
+                        ef_search: int = None, rows: np.ndarray = None) -> HnswIndex:
+    """Build an index from a snapshot's vectors (optionally only `rows`), in chunks to bound memory."""
+    rows = np.arange(len(snapshot)) if rows is None else rows
+    index = HnswIndex.create(
+        snapshot.vectors.shape[1], m=m, ef_construction=ef_construction, ef_search=ef_search,
+        max_elements=max(len(rows), 1)
+    )
+    for start in range(0, len(rows), ADD_CHUNK_SIZE):
+        chunk = np.sort(rows[start:start + ADD_CHUNK_SIZE])
+        attributes = [
+            {field: snapshot.attribute_values[field][snapshot.attribute_codes[field][row]] for field in FILTER_FIELDS}
+            for row in chunk
+        ]
+        index.add([int(job_id) for job_id in snapshot.job_ids[chunk]], snapshot.vectors[chunk], attributes)
+    return index
+
+def save_index_version(index: HnswIndex, index_dir: str = None) -> str:
+    """Write the index as a new version and point CURRENT at it. Returns the version."""
+    index_dir = index_dir or settings.HNSW_INDEX_DIR
+    os.makedirs(index_dir, exist_ok=True)
+    version = f"v{int(time.time() * 1000)}"
+    build_path = os.path.join(index_dir, f"{version}.building")
+    os.makedirs(build_path)
+    index.save(build_path)
+    os.rename(build_path, os.path.join(index_dir, version))
+    _write_current_marker(index_dir, version)
+    _prune_old_versions(index_dir, version)
+    return version
+
+class HnswVectorStore:
+    """
+    Self-hosted stand-in for VectorDatabaseService backed by an HnswIndex in
+    HNSW_INDEX_DIR. One process at a time holds the writer lock (normally the
+    one running the indexing worker); it applies writes in memory and saves
+    them as a new version on a timer thread HNSW_SAVE_SECONDS after the
+    previous save, and at exit. Other processes only search, switching to
+    newer versions as they are saved, and refuse writes.
+    """
+
+    def __init__(self, index_dir: str = None):
+        self.index_dir = index_dir or settings.HNSW_INDEX_DIR
+        self._index: Optional[HnswIndex] = None
+        self._version: Optional[str] = None
+        self._dirty = False
+        self._save_pending = False
+        self._saved_at = time.monotonic()
+        self._checked_at = None
+        self._writer_lock_file = None
+        self._after_save: List[Callable[[], None]] = []
+        self._lock = threading.RLock()
+        self._refresh()
+        atexit.register(self.save)
+
+    @property
+    def is_writer(self) -> bool:
+        return self._writer_lock_file is not None
+
+    def acquire_writer(self) -> bool:
+        """
+        Try to take the writer lock for HNSW_INDEX_DIR without blocking. The
+        holder keeps it until exit and starts from the latest saved version.
+        """
+        if self.is_writer:
+            return True
+        os.makedirs(self.index_dir, exist_ok=True)
+        lock_file = open(os.path.join(self.index_dir, WRITER_LOCK), "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        with self._lock:
+            self._writer_lock_file = lock_file
+            self._load_current()
+        logger.info(f"Holding the HNSW writer lock for {self.index_dir}")
+        return True
+
+    def _require_writer(self):
+        if not self.acquire_writer():
+            raise RuntimeError(
+                f"Another process holds the HNSW writer lock for {self.index_dir}; "
+                "vector writes go through the indexing outbox"
+            )
+
+    def _refresh(self):
+        """Pick up versions saved by the writer. The writer itself never reloads."""
+        now = time.monotonic()
+        if self.is_writer or (self._checked_at is not None and now - self._checked_at < settings.SNAPSHOT_REFRESH_SECONDS):
+            return
+        self._checked_at = now
+        self._load_current()
+
+    def _load_current(self):
+        version = read_current_version(self.index_dir)
+        if version is None or version == self._version:
+            return
+        try:
+            index = HnswIndex.load(os.path.join(self.index_dir, version))
+        except Exception as e:
+            logger.error(f"Failed to load HNSW index {version}: {e}")
+            return
+        self._index, self._version = index, version
+        logger.info(f"Loaded HNSW index {version} ({len(index)} jobs)")
+
+    def _written(self):
+        """Mark unsaved writes and schedule a save HNSW_SAVE_SECONDS after the previous one."""
+        self._dirty = True
+        if not self._save_pending:
+            self._save_pending = True
+            delay = max(0.0, settings.HNSW_SAVE_SECONDS - (time.monotonic() - self._saved_at))
+            timer = threading.Timer(delay, self.save)
+            timer.daemon = True
+            timer.start()
+
+    def after_persist(self, callback: Callable[[], None]):
+        """Run `callback` once the writes made so far are saved (right away if there are none)."""
+        with self._lock:
+            if self._dirty:
+                self._after_save.append(callback)
+                return
+        callback()
+
+    def save(self):
+        """Persist unsaved writes as a new version, then run the callbacks waiting for them."""
+        with self._lock:
+            self._save_pending = False
+            if not self._dirty or self._index is None or not self.is_writer:
+                return
+            try:
+                self._version = save_index_version(self._index, self.index_dir)
+            except Exception as e:
+                # Retried on the next write or at exit; waiting callbacks keep waiting
+                logger.error(f"Error saving HNSW index: {e}")
+                return
+            self._dirty = False
+            self._saved_at = time.monotonic()
+            callbacks, self._after_save = self._after_save, []
+            logger.info(f"Saved HNSW index {self._version} ({len(self._index)} jobs)")
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Error running HNSW after-save callback: {e}")
+
+    async def upsert_job_embedding(self, job_id: str, embedding: List[float], metadata: Dict[str, Any]):
+        await self.upsert_job_embeddings([(job_id, embedding, metadata)])
+
+    async def upsert_job_embeddings(self, items: List[Tuple[str, List[float], Dict[str, Any]]], batch_size: int = None):
+        """Insert or replace job vectors in the graph."""
+        if not items:
+            return
+        self._require_writer()
+        with self._lock:
+            if self._index is None:
+                self._index = HnswIndex.create(len(items[0][1]), max_elements=max(len(items), 1024))
+            self._index.add(
+                [int(job_id) for job_id, _, _ in items],
+                np.asarray([embedding for _, embedding, _ in items], dtype=np.float32),
+                [metadata for _, _, metadata in items]
+            )
+            self._written()
+        logger.info(f"Upserted {len(items)} job embeddings into the HNSW index")
+
+    async def search_similar_jobs(self, query_embedding: List[float], top_k: int = 10, filters: Optional[Dict] = None) -> List[Dict]:
+        self._refresh()
+        index = self._index
+        if index is None:
+            return []
+        return index.search(query_embedding, top_k=top_k, filters=filters)
+
+    async def fetch_job_embeddings(self, job_ids: List[str], batch_size: int = None) -> Dict[str, List[float]]:
+        self._refresh()
+        if self._index is None:
+            return {}
+        return {str(job_id): vector for job_id, vector in self._index.get_vectors([int(job_id) for job_id in job_ids]).items()}
+
+    async def list_job_ids(self) -> List[str]:
+        self._refresh()
+        return [] if self._index is None else [str(job_id) for job_id in self._index.attributes]
+
+    async def delete_job_embeddings(self, job_ids: List[str], batch_size: int = None):
+        self._require_writer()
+        with self._lock:
+            if self._index is None:
+                return
+            self._index.delete([int(job_id) for job_id in job_ids])
+            self._written()
+        logger.info(f"Deleted {len(job_ids)} job embeddings from the HNSW index")
+
+    async def delete_job_embedding(self, job_id: str):
+        await self.delete_job_embeddings([job_id])
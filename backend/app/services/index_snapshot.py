@@ -0,0 +1,336 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Optional
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.text import normalize_term
+from app.models.database import JobRole
+from app.services.ai_service import VectorDatabaseService
+
+logger = logging.getLogger(__name__)
+
+# Snapshot layout (one directory per version, never modified after publishing):
+#   <SNAPSHOT_DIR>/CURRENT                 name of the live version
+#   <SNAPSHOT_DIR>/<version>/vectors.npy   float32 (n, dim), L2-normalized
+#   <SNAPSHOT_DIR>/<version>/job_ids.npy   int64 (n,)
+#   <SNAPSHOT_DIR>/<version>/vector_keys.npy  model+fingerprint hash per row, for reuse by the next build
+#   <SNAPSHOT_DIR>/<version>/<field>.npy   int32 codes for each filterable field
+#   <SNAPSHOT_DIR>/<version>/metadata.json attribute values, skill vocabulary, catalog signature
+CURRENT_MARKER = "CURRENT"
+FILTER_FIELDS = ("industry", "experience_level")
+BUILD_CHUNK_SIZE = 1000
+
+def read_current_version(snapshot_dir: str) -> Optional[str]:
+    """Return the live snapshot version, or None if nothing has been published."""
+    try:
+        with open(os.path.join(snapshot_dir, CURRENT_MARKER)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+def _write_current_marker(snapshot_dir: str, version: str):
+    """Atomically point CURRENT at a new version."""
+    tmp_path = os.path.join(snapshot_dir, f"{CURRENT_MARKER}.tmp")
+    with open(tmp_path, "w") as f:
+        f.write(version)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, os.path.join(snapshot_dir, CURRENT_MARKER))
+
+def _vector_key(embedding_model: Optional[str], embedding_fingerprint: Optional[str]) -> bytes:
+    """Identifies the exact vector stored for a job; empty when it cannot be trusted for reuse."""
+    if not embedding_model or not embedding_fingerprint:
+        return b""
+    return hashlib.sha256(f"{embedding_model}:{embedding_fingerprint}".encode("utf-8")).hexdigest().encode("ascii")
+
+class IndexSnapshot:
+    """Read-only view of one published snapshot. Arrays are memory-mapped and shared via the page cache."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, "metadata.json")) as f:
+            self.metadata = json.load(f)
+        self.version = self.metadata["version"]
+        self.vectors = np.load(os.path.join(path, "vectors.npy"), mmap_mode="r")
+        self.job_ids = np.load(os.path.join(path, "job_ids.npy"), mmap_mode="r")
+        self.vector_keys = np.load(os.path.join(path, "vector_keys.npy"), mmap_mode="r")
+        self.attribute_codes = {
+            field: np.load(os.path.join(path, f"{field}.npy"), mmap_mode="r") for field in FILTER_FIELDS
+        }
+        self.attribute_values: Dict[str, List[str]] = self.metadata["attributes"]
+        self.skills: Dict[str, Dict[str, Any]] = self.metadata["skills"]
+
+    def __len__(self) -> int:
+        return len(self.job_ids)
+
+    def _filter_rows(self, filters: Optional[Dict]) -> Optional[np.ndarray]:
+        """Row indices matching Pinecone-style equality / $in filters, or None for no filtering."""
+        if not filters:
+            return None
+        mask = np.ones(len(self), dtype=bool)
+        for field, condition in filters.items():
+            if field not in self.attribute_codes:
+                raise ValueError(f"Unsupported snapshot filter field: {field}")
+            wanted = condition["$in"] if isinstance(condition, dict) else [condition]
+            codes = {value: code for code, value in enumerate(self.attribute_values[field])}
+            mask &= np.isin(self.attribute_codes[field], [codes[value] for value in wanted if value in codes])
+        return np.flatnonzero(mask)
+
+    def search(self, query_embedding: List[float], top_k: int = 10, filters: Optional[Dict] = None) -> List[Dict]:
+        """Exact cosine search over the snapshot, returning matches shaped like Pinecone's."""
+        if len(self) == 0:
+            return []
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+
+        rows = self._filter_rows(filters)
+        scores = (self.vectors if rows is None else self.vectors[rows]) @ query
+        k = min(top_k, len(scores))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        matches = []
+        for position in top:
+            row = position if rows is None else rows[position]
+            matches.append({
+                'job_id': str(int(self.job_ids[row])),
+                'similarity_score': float(scores[position]),
+                'metadata': {
+                    field: self.attribute_values[field][self.attribute_codes[field][row]] for field in FILTER_FIELDS
+                }
+            })
+        return matches
+
+class SnapshotManager:
+    """
+    Holds the live snapshot for this process and swaps to a newer one when the
+    CURRENT marker changes. Searches already running keep the snapshot they started with.
+    """
+
+    def __init__(self, snapshot_dir: str = None, refresh_seconds: float = None):
+        self.snapshot_dir = snapshot_dir or settings.SNAPSHOT_DIR
+        self.refresh_seconds = refresh_seconds if refresh_seconds is not None else settings.SNAPSHOT_REFRESH_SECONDS
+        self._snapshot: Optional[IndexSnapshot] = None
+        self._checked_at = None
+
+    def current(self) -> Optional[IndexSnapshot]:
+        now = time.monotonic()
+        if self._checked_at is None or now - self._checked_at >= self.refresh_seconds:
+            self._checked_at = now
+            self._refresh()
+        return self._snapshot
+
+    def _refresh(self):
+        version = read_current_version(self.snapshot_dir)
+        if version is None or (self._snapshot is not None and self._snapshot.version == version):
+            return
+        try:
+            snapshot = IndexSnapshot(os.path.join(self.snapshot_dir, version))
+        except Exception as e:
+            logger.error(f"Failed to load index snapshot {version}: {e}")
+            return
+        self._snapshot = snapshot
+        logger.info(f"Switched to index snapshot {version} ({len(snapshot)} jobs)")
+
+class SnapshotVectorSearch:
+    """Answers similarity queries from the memory-mapped snapshot instead of Pinecone."""
+
+    def __init__(self, manager: SnapshotManager = None):
+        self.manager = manager or snapshot_manager
+
+    async def search_similar_jobs(self, query_embedding: List[float], top_k: int = 10, filters: Optional[Dict] = None) -> List[Dict]:
+        snapshot = self.manager.current()
+        if snapshot is None:
+            from app.services.ai_service import get_vector_db
+
+            logger.warning("No index snapshot published yet, querying Pinecone")
+            return await get_vector_db().search_similar_jobs(query_embedding, top_k=top_k, filters=filters)
+        return snapshot.search(query_embedding, top_k=top_k, filters=filters)
+
+snapshot_manager = SnapshotManager()
+
+def catalog_signature(db: Session) -> str:
+    """Cheap fingerprint of the indexed catalog; a new snapshot is needed when it changes."""
+    count, max_id, max_updated, max_created = db.query(
+        func.count(JobRole.id), func.max(JobRole.id), func.max(JobRole.updated_at), func.max(JobRole.created_at)
+    ).filter(JobRole.embedding_id.isnot(None)).one()
+    return f"{count}:{max_id}:{max_updated}:{max_created}"
+
+async def build_snapshot(
+    db: Session,
+    vector_db: VectorDatabaseService,
+    snapshot_dir: str = None,
+    force: bool = False
+) -> Optional[str]:
+    """
+    Write and publish a new snapshot of every indexed job. Vectors are reused
+    from the previous snapshot when the job's model and fingerprint are
+    unchanged, so only new or re-embedded jobs are fetched from Pinecone.
+    Returns the new version, or None if the catalog has not changed.
+    """
+    snapshot_dir = snapshot_dir or settings.SNAPSHOT_DIR
+    os.makedirs(snapshot_dir, exist_ok=True)
+
+    previous = None
+    previous_version = read_current_version(snapshot_dir)
+    if previous_version:
+        try:
+            previous = IndexSnapshot(os.path.join(snapshot_dir, previous_version))
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable snapshot {previous_version}: {e}")
+
+    signature = catalog_signature(db)
+    if not force and previous is not None and previous.metadata.get("catalog_signature") == signature:
+        return None
+
+    previous_rows = {}
+    if previous is not None:
+        previous_rows = {int(job_id): row for row, job_id in enumerate(previous.job_ids)}
+
+    total = db.query(func.count(JobRole.id)).filter(JobRole.embedding_id.isnot(None)).scalar()
+    query = db.query(
+        JobRole.id, JobRole.industry, JobRole.experience_level, JobRole.required_skills,
+        JobRole.embedding_model, JobRole.embedding_fingerprint
+    ).filter(JobRole.embedding_id.isnot(None)).order_by(JobRole.id).limit(total)
+
+    version = f"v{int(time.time() * 1000)}"
+    build_path = os.path.join(snapshot_dir, f"{version}.building")
+    os.makedirs(build_path)
+
+    try:
+        writer = _SnapshotWriter(build_path, total, previous, previous_rows, vector_db)
+        chunk = []
+        for job in query.yield_per(BUILD_CHUNK_SIZE):
+            chunk.append(job)
+            if len(chunk) == BUILD_CHUNK_SIZE:
+                await writer.add_chunk(chunk)
+                chunk = []
+        if chunk:
+            await writer.add_chunk(chunk)
+        writer.finish(version, signature)
+        os.rename(build_path, os.path.join(snapshot_dir, version))
+    except Exception:
+        shutil.rmtree(build_path, ignore_errors=True)
+        raise
+
+    _write_current_marker(snapshot_dir, version)
+    _prune_old_versions(snapshot_dir, version)
+    logger.info(
+        f"Published index snapshot {version}: {writer.written} jobs "
+        f"({writer.reused} reused, {writer.fetched} fetched)"
+    )
+    return version
+
+class _SnapshotWriter:
+    """Accumulates snapshot arrays for one build, streaming vectors into a memory-mapped file."""
+
+    def __init__(self, build_path: str, total: int, previous: Optional[IndexSnapshot],
+                 previous_rows: Dict[int, int], vector_db: VectorDatabaseService):
+        self.build_path = build_path
+        self.total = total
+        self.previous = previous
+        self.previous_rows = previous_rows
+        self.vector_db = vector_db
+        self.vectors = None
+        self.job_ids = np.zeros(total, dtype=np.int64)
+        self.vector_keys = np.zeros(total, dtype="S64")
+        self.attribute_codes = {field: np.zeros(total, dtype=np.int32) for field in FILTER_FIELDS}
+        self.attribute_values: Dict[str, Dict[str, int]] = {field: {} for field in FILTER_FIELDS}
+        self.skills: Dict[str, Dict[str, Any]] = {}
+        self.written = self.reused = self.fetched = 0
+
+    async def _resolve_vectors(self, jobs) -> Dict[int, np.ndarray]:
+        """Vectors for a chunk: reused from the previous snapshot where unchanged, else fetched."""
+        resolved = {}
+        to_fetch = []
+        for job in jobs:
+            key = _vector_key(job.embedding_model, job.embedding_fingerprint)
+            row = self.previous_rows.get(job.id)
+            if key and row is not None and self.previous.vector_keys[row] == key:
+                resolved[job.id] = self.previous.vectors[row]
+                self.reused += 1
+            else:
+                to_fetch.append(str(job.id))
+        if to_fetch:
+            for job_id, values in (await self.vector_db.fetch_job_embeddings(to_fetch)).items():
+                vector = np.asarray(values, dtype=np.float32)
+                norm = np.linalg.norm(vector)
+                resolved[int(job_id)] = vector / norm if norm else vector
+            self.fetched += len(to_fetch)
+        return resolved
+
+    async def add_chunk(self, jobs):
+        chunk_vectors = await self._resolve_vectors(jobs)
+        if self.vectors is None and chunk_vectors:
+            dimension = len(next(iter(chunk_vectors.values())))
+            self.vectors = np.lib.format.open_memmap(
+                os.path.join(self.build_path, "vectors.npy"), mode="w+", dtype=np.float32,
+                shape=(self.total, dimension)
+            )
+        for job in jobs:
+            vector = chunk_vectors.get(job.id)
+            if vector is None:
+                logger.warning(f"Job {job.id} has no stored vector, leaving it out of the snapshot")
+                continue
+            row = self.written
+            self.vectors[row] = vector
+            self.job_ids[row] = job.id
+            self.vector_keys[row] = _vector_key(job.embedding_model, job.embedding_fingerprint)
+            for field in FILTER_FIELDS:
+                codes = self.attribute_values[field]
+                self.attribute_codes[field][row] = codes.setdefault(getattr(job, field), len(codes))
+            for skill in job.required_skills or []:
+                entry = self.skills.setdefault(normalize_term(skill), {"name": skill, "count": 0})
+                entry["count"] += 1
+            self.written += 1
+
+    def finish(self, version: str, signature: str):
+        """Write the remaining arrays and metadata."""
+        vectors_path = os.path.join(self.build_path, "vectors.npy")
+        if self.vectors is None:
+            np.save(vectors_path, np.zeros((0, 0), dtype=np.float32))
+        elif self.written < self.total:
+            # Jobs without a stored vector were skipped; trim the unused tail
+            trimmed = np.array(self.vectors[:self.written])
+            self.vectors = None
+            np.save(vectors_path, trimmed)
+        else:
+            self.vectors.flush()
+            self.vectors = None
+
+        np.save(os.path.join(self.build_path, "job_ids.npy"), self.job_ids[:self.written])
+        np.save(os.path.join(self.build_path, "vector_keys.npy"), self.vector_keys[:self.written])
+        for field in FILTER_FIELDS:
+            np.save(os.path.join(self.build_path, f"{field}.npy"), self.attribute_codes[field][:self.written])
+
+        with open(os.path.join(self.build_path, "metadata.json"), "w") as f:
+            json.dump({
+                "version": version,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "catalog_signature": signature,
+                "job_count": self.written,
+                "attributes": {field: list(values) for field, values in self.attribute_values.items()},
+                "skills": self.skills
+            }, f)
+
+def _prune_old_versions(snapshot_dir: str, current_version: str):
+    """Remove all but the newest SNAPSHOT_KEEP_VERSIONS versions. Open memory maps stay valid on POSIX."""
+    versions = sorted(
+        (name for name in os.listdir(snapshot_dir)
+         if name.startswith("v") and not name.endswith(".building") and name != current_version),
+        key=lambda name: int(name[1:]) if name[1:].isdigit() else 0
+    )
+    keep = max(settings.SNAPSHOT_KEEP_VERSIONS - 1, 0)
+    for name in versions[:len(versions) - keep] if keep else versions:
+        shutil.rmtree(os.path.join(snapshot_dir, name), ignore_errors=True)
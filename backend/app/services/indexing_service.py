@@ -0,0 +1,243 @@
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Iterable, Optional, Set
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.database import JobRole, JobIndexOutbox
+from app.services.ai_service import EmbeddingService, VectorDatabaseService, get_embedding_service, get_vector_db
+from app.services.neighbor_service import update_neighbors_for_jobs
+
+logger = logging.getLogger(__name__)
+
+INDEXING_PENDING = "pending"
+INDEXING_INDEXED = "indexed"
+INDEXING_FAILED = "failed"
+
+def build_job_text(job: JobRole) -> str:
+    """Create the text that is embedded for a job role."""
+    return f"{job.title}. {job.description}. Required skills: {', '.join(job.required_skills)}. Industry: {job.industry}"
+
+def job_fingerprint(job_text: str) -> str:
+    """Fingerprint of the exact text embedded for a job, used to detect stale vectors."""
+    return hashlib.sha256(job_text.encode("utf-8")).hexdigest()
+
+def build_job_metadata(job: JobRole) -> Dict[str, Any]:
+    """Create the vector metadata stored alongside a job embedding."""
+    metadata = {
+        "title": job.title,
+        "industry": job.industry,
+        "experience_level": job.experience_level,
+        "career_path": job.career_path
+    }
+    if job.location:
+        metadata["location"] = job.location
+    return metadata
+
+def enqueue_job_indexing(db: Session, job_ids: Iterable[int]):
+    """Add outbox entries for jobs; committed together with the caller's transaction."""
+    db.bulk_insert_mappings(JobIndexOutbox, [{"job_role_id": job_id, "attempts": 0} for job_id in job_ids])
+
+def _retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff between indexing attempts, capped at ten minutes."""
+    return timedelta(seconds=min(5 * 2 ** attempts, 600))
+
+def _claim_outbox_batch(db: Session, batch_size: int) -> List[JobIndexOutbox]:
+    """Lease up to batch_size due outbox entries so other workers skip them."""
+    now = datetime.now(timezone.utc)
+    entries = (
+        db.query(JobIndexOutbox)
+        .filter(JobIndexOutbox.available_at <= now)
+        .order_by(JobIndexOutbox.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    for entry in entries:
+        entry.attempts += 1
+        entry.available_at = now + timedelta(seconds=settings.INDEXING_LEASE_SECONDS)
+    db.commit()
+    return entries
+
+async def process_outbox_batch(
+    db: Session,
+    embedding_service: EmbeddingService,
+    vector_db: VectorDatabaseService,
+    batch_size: int = None
+) -> int:
+    """
+    Embed and upsert one batch of outbox entries; entries whose job no longer
+    exists delete its vector. Returns the number of entries claimed, or 0 if
+    another process holds the vector store's writer lock.
+    """
+    if not vector_db.acquire_writer():
+        return 0
+    entries = _claim_outbox_batch(db, batch_size or settings.INDEXING_BATCH_SIZE)
+    if not entries:
+        return 0
+
+    job_ids = {entry.job_role_id for entry in entries}
+    jobs = db.query(JobRole).filter(JobRole.id.in_(job_ids)).all()
+    deleted_ids = job_ids - {job.id for job in jobs}
+
+    job_texts = [build_job_text(job) for job in jobs]
+    embeddings = []
+    try:
+        if deleted_ids:
+            await vector_db.delete_job_embeddings([str(job_id) for job_id in sorted(deleted_ids)])
+        if jobs:
+            embeddings, model_id = await embedding_service.get_batch_embeddings_with_model(job_texts)
+            await vector_db.upsert_job_embeddings([
+                (str(job.id), embedding, build_job_metadata(job))
+                for job, embedding in zip(jobs, embeddings)
+            ])
+    except Exception as e:
+        logger.error(f"Error indexing jobs {sorted(job_ids)}: {e}")
+        _record_failure(db, entries, str(e))
+        return len(entries)
+
+    for job, job_text in zip(jobs, job_texts):
+        job.embedding_id = str(job.id)
+        job.embedding_fingerprint = job_fingerprint(job_text)
+        job.embedding_model = model_id
+        job.indexing_status = INDEXING_INDEXED
+    db.commit()
+    logger.info(f"Indexed {len(jobs)} jobs")
+
+    # Entries stay leased until the vector store has persisted this batch (the
+    # HNSW store saves on a timer); after a crash they are claimed and applied again
+    entry_ids = [entry.id for entry in entries]
+    vector_db.after_persist(lambda: delete_outbox_entries(entry_ids))
+
+    if settings.NEIGHBORS_INCREMENTAL and jobs:
+        try:
+            await update_neighbors_for_jobs(db, vector_db, [(job.id, embedding) for job, embedding in zip(jobs, embeddings)])
+        except Exception as e:
+            # The nightly/offline build repairs anything missed here
+            logger.warning(f"Error updating neighbours for jobs {sorted(job_ids)}: {e}")
+            db.rollback()
+    return len(entries)
+
+def delete_outbox_entries(entry_ids: List[int]):
+    """Remove applied outbox entries. May run on the vector store's save thread, so it uses its own session."""
+    db = SessionLocal()
+    try:
+        db.query(JobIndexOutbox).filter(JobIndexOutbox.id.in_(entry_ids)).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+def _record_failure(db: Session, entries: List[JobIndexOutbox], error: str):
+    """Schedule a retry for failed entries, or mark their jobs failed after the last attempt."""
+    now = datetime.now(timezone.utc)
+    failed_job_ids = []
+    for entry in entries:
+        if entry.attempts >= settings.INDEXING_MAX_ATTEMPTS:
+            failed_job_ids.append(entry.job_role_id)
+            db.delete(entry)
+        else:
+            entry.last_error = error
+            entry.available_at = now + _retry_delay(entry.attempts)
+    if failed_job_ids:
+        logger.error(f"Giving up on indexing jobs {failed_job_ids} after {settings.INDEXING_MAX_ATTEMPTS} attempts")
+        db.query(JobRole).filter(JobRole.id.in_(failed_job_ids)).update(
+            {JobRole.indexing_status: INDEXING_FAILED}, synchronize_session=False
+        )
+    db.commit()
+
+def find_stale_job_ids(db: Session, model_id: str, vector_ids: Optional[Set[str]] = None, chunk_size: int = 1000) -> List[int]:
+    """
+    Find jobs whose vector is missing, was built by another model, or no
+    longer matches the job's current text. With `vector_ids` (the IDs in the
+    vector store), jobs recorded as embedded but absent from the store count
+    as stale too.
+    """
+    stale_ids = []
+    query = db.query(
+        JobRole.id, JobRole.title, JobRole.description, JobRole.required_skills, JobRole.industry,
+        JobRole.embedding_id, JobRole.embedding_fingerprint, JobRole.embedding_model
+    ).order_by(JobRole.id).yield_per(chunk_size)
+    for row in query:
+        if (
+            row.embedding_id is None
+            or (vector_ids is not None and str(row.id) not in vector_ids)
+            or row.embedding_model != model_id
+            or row.embedding_fingerprint != job_fingerprint(build_job_text(row))
+        ):
+            stale_ids.append(row.id)
+    return stale_ids
+
+def enqueue_stale_jobs(db: Session, model_id: str, vector_ids: Optional[Set[str]] = None) -> List[int]:
+    """Queue stale jobs for re-embedding, skipping jobs already in the outbox."""
+    stale_ids = find_stale_job_ids(db, model_id, vector_ids)
+    queued_ids = {job_id for (job_id,) in db.query(JobIndexOutbox.job_role_id).distinct()}
+    to_queue = [job_id for job_id in stale_ids if job_id not in queued_ids]
+    if to_queue:
+        db.query(JobRole).filter(JobRole.id.in_(to_queue)).update(
+            {JobRole.indexing_status: INDEXING_PENDING}, synchronize_session=False
+        )
+        enqueue_job_indexing(db, to_queue)
+        db.commit()
+    return to_queue
+
+async def prune_orphan_vectors(db: Session, vector_db: VectorDatabaseService, dry_run: bool = False) -> List[str]:
+    """Delete vectors whose job no longer exists in job_roles."""
+    job_ids = {str(job_id) for (job_id,) in db.query(JobRole.id)}
+    orphan_ids = [vector_id for vector_id in await vector_db.list_job_ids() if vector_id not in job_ids]
+    if orphan_ids and not dry_run:
+        await vector_db.delete_job_embeddings(orphan_ids)
+    return orphan_ids
+
+class IndexingWorker:
+    """Background task that drains the job index outbox in batches."""
+
+    def __init__(self, batch_size: int = None, poll_interval: float = None):
+        self.batch_size = batch_size or settings.INDEXING_BATCH_SIZE
+        self.poll_interval = poll_interval or settings.INDEXING_POLL_INTERVAL_SECONDS
+        self._task = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+            logger.info("Indexing worker started")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            logger.info("Indexing worker stopped")
+
+    def _process_batch(self) -> int:
+        """
+        Process one outbox batch on a worker thread with its own session and
+        event loop. The provider SDKs and Pinecone client block, so running the
+        batch on the API event loop would stall request handling.
+        """
+        db = SessionLocal()
+        try:
+            return asyncio.run(process_outbox_batch(
+                db, get_embedding_service(), get_vector_db(), self.batch_size
+            ))
+        except Exception as e:
+            logger.error(f"Indexing worker error: {e}")
+            db.rollback()
+            return 0
+        finally:
+            db.close()
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            processed = await loop.run_in_executor(None, self._process_batch)
+
+            # Keep draining while there is a backlog, otherwise poll
+            if processed < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
+
+indexing_worker = IndexingWorker()
@@ -0,0 +1,44 @@
+import logging
+from typing import List, Optional, Tuple
+from app.models.database import JobRole
+from app.services.facet_index import FacetIndex, get_facet_index
+from app.services.skill_index import SkillPrefixIndex, get_skill_index
+
+logger = logging.getLogger(__name__)
+
+# The in-memory skill and facet indexes are loaded before a job write and
+# updated after it commits. Loaded afterwards, a first (lazy) load would
+# already include the write and the update would count it twice. Updates are
+# best effort: a failure is logged, never reported as a failed write, and the
+# periodic facet rebuild repairs the counts.
+
+JobIndexes = Tuple[SkillPrefixIndex, FacetIndex]
+
+def load_job_indexes() -> Optional[JobIndexes]:
+    """The skill and facet indexes, or None if loading failed (the next load then picks up the write)."""
+    try:
+        return get_skill_index(), get_facet_index()
+    except Exception as e:
+        logger.warning(f"Error loading the in-memory job indexes: {e}")
+        return None
+
+def index_added_jobs(indexes: Optional[JobIndexes], jobs: List[JobRole]):
+    if indexes is None:
+        return
+    skill_index, facet_index = indexes
+    try:
+        skill_index.add_skills(skill for job in jobs for skill in job.required_skills or [])
+        for job in jobs:
+            facet_index.add_job(job)
+    except Exception as e:
+        logger.warning(f"Error adding {len(jobs)} jobs to the in-memory indexes: {e}")
+
+def index_removed_job(indexes: Optional[JobIndexes], job_id: int, required_skills: List[str]):
+    if indexes is None:
+        return
+    skill_index, facet_index = indexes
+    try:
+        facet_index.remove_job(job_id)
+        skill_index.remove_skills(required_skills or [])
+    except Exception as e:
+        logger.warning(f"Error removing job {job_id} from the in-memory indexes: {e}")
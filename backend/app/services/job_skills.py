@@ -0,0 +1,91 @@
+import logging
+from typing import List, Dict, Iterable
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, Query
+from app.core.text import normalize_term
+from app.models.database import JobRole, Skill, JobSkill
+
+logger = logging.getLogger(__name__)
+
+SKILLS_MATCH_ANY = "any"
+SKILLS_MATCH_ALL = "all"
+
+def get_or_create_skill_ids(db: Session, names: Iterable[str]) -> Dict[str, int]:
+    """Map normalized skill names to skill IDs, creating missing skills in savepoints."""
+    display_names = {}
+    for name in names:
+        key = normalize_term(name)
+        if key:
+            display_names.setdefault(key, name.strip())
+    if not display_names:
+        return {}
+
+    skill_ids = dict(
+        db.query(Skill.normalized_name, Skill.id).filter(Skill.normalized_name.in_(display_names))
+    )
+    missing = [key for key in display_names if key not in skill_ids]
+    if missing:
+        try:
+            with db.begin_nested():
+                db.add_all(Skill(name=display_names[key], normalized_name=key) for key in missing)
+        except IntegrityError:
+            # A concurrent insert created some of them first and the savepoint
+            # dropped all of ours; retry one skill per savepoint
+            for key in missing:
+                try:
+                    with db.begin_nested():
+                        db.add(Skill(name=display_names[key], normalized_name=key))
+                except IntegrityError:
+                    pass
+        skill_ids.update(
+            db.query(Skill.normalized_name, Skill.id).filter(Skill.normalized_name.in_(missing))
+        )
+    return skill_ids
+
+def link_job_skills(db: Session, jobs: List[JobRole]):
+    """Insert job_skills rows for freshly inserted jobs (ids must be assigned)."""
+    skill_ids = get_or_create_skill_ids(db, (skill for job in jobs for skill in job.required_skills or []))
+    rows = []
+    for job in jobs:
+        job_skill_ids = {skill_ids[normalize_term(skill)] for skill in job.required_skills or [] if normalize_term(skill)}
+        rows.extend({"job_role_id": job.id, "skill_id": skill_id} for skill_id in job_skill_ids)
+    if rows:
+        db.bulk_insert_mappings(JobSkill, rows)
+
+def backfill_job_skills(db: Session, chunk_size: int = 1000) -> int:
+    """Link every job that has no job_skills rows yet. Returns the number of jobs processed."""
+    linked = 0
+    last_id = 0
+    while True:
+        jobs = (
+            db.query(JobRole)
+            .filter(JobRole.id > last_id, ~JobRole.id.in_(select(JobSkill.job_role_id)))
+            .order_by(JobRole.id)
+            .limit(chunk_size)
+            .all()
+        )
+        if not jobs:
+            return linked
+        link_job_skills(db, jobs)
+        db.commit()
+        last_id = jobs[-1].id
+        linked += len(jobs)
+        logger.info(f"Processed skills for {linked} jobs")
+
+def filter_jobs_by_skills(db: Session, query: Query, skills: List[str], match: str = SKILLS_MATCH_ANY) -> Query:
+    """
+    Restrict a JobRole query to jobs requiring any / all of the given skills,
+    using the job_skills index rather than the required_skills JSON.
+    """
+    keys = list({normalize_term(skill) for skill in skills if normalize_term(skill)})
+    if not keys:
+        return query
+    skill_ids = [skill_id for (skill_id,) in db.query(Skill.id).filter(Skill.normalized_name.in_(keys))]
+    if not skill_ids or (match == SKILLS_MATCH_ALL and len(skill_ids) < len(keys)):
+        return query.filter(False)
+
+    job_ids = select(JobSkill.job_role_id).where(JobSkill.skill_id.in_(skill_ids))
+    if match == SKILLS_MATCH_ALL:
+        job_ids = job_ids.group_by(JobSkill.job_role_id).having(func.count(JobSkill.skill_id) == len(skill_ids))
+    return query.filter(JobRole.id.in_(job_ids))
@@ -0,0 +1,88 @@
+import csv
+import logging
+import threading
+from functools import lru_cache
+from typing import List, Dict, Optional
+from app.core.config import settings
+from app.core.text import normalize_term
+from app.schemas.career import LearningResource
+
+logger = logging.getLogger(__name__)
+
+# Preferred resource difficulties for a skill gap, by the user's experience level
+LEVEL_DIFFICULTIES = {
+    "entry": ["beginner", "intermediate"],
+    "mid": ["beginner", "intermediate", "advanced"],
+    "senior": ["intermediate", "advanced"]
+}
+
+class LearningResourceCatalog:
+    """
+    Learning resources indexed by normalized skill and difficulty. Skills with
+    no curated resources get generic placeholders, created once and reused.
+    """
+
+    def __init__(self, resources: List[LearningResource]):
+        self._by_id: Dict[str, LearningResource] = {}
+        self._index: Dict[str, Dict[str, List[str]]] = {}
+        self._lock = threading.Lock()
+        for resource in resources:
+            self._add(resource)
+
+    @classmethod
+    def from_csv(cls, path: str) -> "LearningResourceCatalog":
+        resources = []
+        try:
+            with open(path, newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    resources.append(LearningResource(**{key: value or None for key, value in row.items()}))
+        except FileNotFoundError:
+            logger.warning(f"Learning resource catalog {path} not found, using generic resources only")
+        return cls(resources)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def _add(self, resource: LearningResource):
+        self._by_id[resource.id] = resource
+        by_difficulty = self._index.setdefault(normalize_term(resource.skill), {})
+        by_difficulty.setdefault(resource.difficulty, []).append(resource.id)
+
+    def _add_generic(self, skill: str, key: str):
+        for resource in (
+            LearningResource(
+                id=f"generic-course:{key}", skill=skill, title=f"Learn {skill} - Online Course",
+                type="course", provider="Various Platforms", duration="4-8 weeks", difficulty="beginner"
+            ),
+            LearningResource(
+                id=f"generic-certification:{key}", skill=skill, title=f"{skill} Certification",
+                type="certification", provider="Industry Standard", duration="2-3 months", difficulty="intermediate"
+            )
+        ):
+            self._add(resource)
+
+    def get(self, resource_id: str) -> Optional[LearningResource]:
+        return self._by_id.get(resource_id)
+
+    def resource_ids_for(self, skill: str, experience_level: str = "entry", limit: int = 3) -> List[str]:
+        """Resource IDs for a skill, preferring difficulties suited to the experience level."""
+        key = normalize_term(skill)
+        by_difficulty = self._index.get(key)
+        if by_difficulty is None:
+            with self._lock:
+                if key not in self._index:
+                    self._add_generic(skill, key)
+            by_difficulty = self._index[key]
+
+        preferred = LEVEL_DIFFICULTIES.get(experience_level, LEVEL_DIFFICULTIES["entry"])
+        resource_ids = [resource_id for difficulty in preferred for resource_id in by_difficulty.get(difficulty, [])]
+        if not resource_ids:
+            resource_ids = [resource_id for ids in by_difficulty.values() for resource_id in ids]
+        return resource_ids[:limit]
+
+@lru_cache()
+def get_learning_catalog() -> LearningResourceCatalog:
+    """Process-wide catalog loaded from LEARNING_RESOURCES_PATH."""
+    catalog = LearningResourceCatalog.from_csv(settings.LEARNING_RESOURCES_PATH)
+    logger.info(f"Loaded {len(catalog)} learning resources")
+    return catalog
@@ -0,0 +1,96 @@
+import logging
+from typing import List, Tuple
+import numpy as np
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.database import JobNeighbor
+from app.services.index_snapshot import IndexSnapshot
+
+logger = logging.getLogger(__name__)
+
+# Working memory per (job, job) pair in a block: the float32 score and the
+# int64 index argpartition returns for it
+BYTES_PER_SCORE = 4 + 8
+
+def neighbor_block_size(total: int, memory_mb: int = None) -> int:
+    """Jobs per block so a block's score matrix against all `total` jobs fits in the memory budget."""
+    memory_mb = memory_mb or settings.NEIGHBORS_BUILD_MEMORY_MB
+    return max(1, memory_mb * 1024 * 1024 // (BYTES_PER_SCORE * max(total, 1)))
+
+def build_neighbor_table(db: Session, snapshot: IndexSnapshot, top_n: int = None, block_size: int = None) -> int:
+    """
+    Compute the top-N most similar jobs for every job in a snapshot with
+    blocked matrix products and store them in job_neighbors. Each block is
+    replaced in its own transaction, so readers never see an empty table.
+    Blocks are sized from NEIGHBORS_BUILD_MEMORY_MB unless `block_size` is
+    given. Returns the number of jobs processed.
+    """
+    top_n = top_n or settings.NEIGHBORS_TOP_N
+    total = len(snapshot)
+    k = min(top_n, total - 1)
+    if k <= 0:
+        return 0
+    block_size = block_size or neighbor_block_size(total)
+    logger.info(f"Scoring {total} jobs in blocks of {block_size}")
+
+    vectors = snapshot.vectors
+    for start in range(0, total, block_size):
+        end = min(start + block_size, total)
+        scores = np.asarray(vectors[start:end]) @ vectors.T
+        scores[np.arange(end - start), np.arange(start, end)] = -np.inf  # exclude self
+
+        top = np.argpartition(scores, -k, axis=1)[:, -k:]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+        block_ids = [int(job_id) for job_id in snapshot.job_ids[start:end]]
+        db.query(JobNeighbor).filter(JobNeighbor.job_role_id.in_(block_ids)).delete(synchronize_session=False)
+        db.bulk_insert_mappings(JobNeighbor, [
+            {
+                "job_role_id": job_id,
+                "rank": rank,
+                "neighbor_id": int(snapshot.job_ids[top[row, rank]]),
+                "similarity_score": float(top_scores[row, rank])
+            }
+            for row, job_id in enumerate(block_ids)
+            for rank in range(k)
+        ])
+        db.commit()
+        logger.info(f"Stored neighbours for jobs {start + 1}-{end} of {total}")
+    return total
+
+def _store_neighbors(db: Session, job_id: int, neighbors: List[Tuple[int, float]]):
+    db.query(JobNeighbor).filter(JobNeighbor.job_role_id == job_id).delete(synchronize_session=False)
+    db.bulk_insert_mappings(JobNeighbor, [
+        {"job_role_id": job_id, "rank": rank, "neighbor_id": neighbor_id, "similarity_score": score}
+        for rank, (neighbor_id, score) in enumerate(neighbors)
+    ])
+
+async def update_neighbors_for_jobs(db: Session, vector_search, items: List[Tuple[int, List[float]]], top_n: int = None):
+    """
+    Incrementally maintain job_neighbors for newly embedded jobs: store each
+    job's own top-N and insert it into the lists of neighbours it now beats.
+    """
+    top_n = top_n or settings.NEIGHBORS_TOP_N
+    for job_id, embedding in items:
+        matches = await vector_search.search_similar_jobs(embedding, top_k=top_n + 1)
+        neighbors = [
+            (int(match['job_id']), float(match['similarity_score']))
+            for match in matches if int(match['job_id']) != job_id
+        ][:top_n]
+        _store_neighbors(db, job_id, neighbors)
+
+        # Similarity is symmetric, so this job may belong in its neighbours' lists
+        neighbor_ids = [neighbor_id for neighbor_id, _ in neighbors]
+        existing = {}
+        for row in db.query(JobNeighbor).filter(JobNeighbor.job_role_id.in_(neighbor_ids)):
+            existing.setdefault(row.job_role_id, []).append((row.neighbor_id, row.similarity_score))
+        for neighbor_id, score in neighbors:
+            current = [entry for entry in existing.get(neighbor_id, []) if entry[0] != job_id]
+            if len(current) >= top_n and score <= min(entry[1] for entry in current):
+                continue
+            updated = sorted(current + [(job_id, score)], key=lambda entry: -entry[1])[:top_n]
+            _store_neighbors(db, neighbor_id, updated)
+    db.commit()
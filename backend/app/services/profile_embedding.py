@@ -0,0 +1,153 @@
+import logging
+from collections import OrderedDict
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
+import numpy as np
+from sqlalchemy import tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.metrics import metrics
+from app.core.text import normalize_term
+from app.models.database import TermEmbedding
+from app.schemas.career import SkillAnalysisRequest
+from app.services.ai_service import EmbeddingService, get_embedding_service
+
+logger = logging.getLogger(__name__)
+
+# Text embedded for a single vocabulary term, per kind
+TERM_TEMPLATES = {
+    "skill": "Skills: {}",
+    "interest": "Interests: {}",
+    "industry": "Preferred industries: {}",
+    "experience_level": "Experience level: {}",
+}
+
+TermKey = Tuple[str, str]
+
+class ProfileEmbeddingService:
+    """
+    Builds user query vectors from cached per-term vectors: the mean vector of
+    each kind (skills, interests, industries, level), combined with the
+    configured weights and L2-normalized. Only terms not yet in the vocabulary
+    are sent to the provider, in one batch, and then stored.
+    """
+
+    def __init__(self, embedding_service: EmbeddingService):
+        self.embedding_service = embedding_service
+        self._cache: "OrderedDict[TermKey, np.ndarray]" = OrderedDict()
+        self.provider_calls = 0
+
+    def profile_terms(self, request: SkillAnalysisRequest) -> Dict[str, List[str]]:
+        """Normalized, de-duplicated terms of a profile, grouped by kind."""
+        groups = {
+            "skill": request.skills,
+            "interest": request.interests or [],
+            "industry": request.preferred_industries or [],
+            "experience_level": [request.experience_level],
+        }
+        return {
+            kind: list(dict.fromkeys(normalize_term(term) for term in terms if term.strip()))
+            for kind, terms in groups.items()
+        }
+
+    async def embed_profile(self, request: SkillAnalysisRequest, db: Session) -> Optional[List[float]]:
+        """
+        The composed profile vector, or None when it cannot be composed (every
+        term is blank, or new terms were embedded by a fallback model); callers
+        then embed the profile as text.
+        """
+        terms = self.profile_terms(request)
+        keys = [(kind, term) for kind, kind_terms in terms.items() for term in kind_terms]
+        if not keys:
+            return None
+        vectors = await self._get_term_vectors(keys, db)
+        if vectors is None:
+            return None
+
+        weights = {
+            "skill": settings.PROFILE_SKILL_WEIGHT,
+            "interest": settings.PROFILE_INTEREST_WEIGHT,
+            "industry": settings.PROFILE_INDUSTRY_WEIGHT,
+            "experience_level": settings.PROFILE_LEVEL_WEIGHT,
+        }
+        combined = None
+        for kind, kind_terms in terms.items():
+            if not kind_terms:
+                continue
+            group = np.mean([vectors[(kind, term)] for term in kind_terms], axis=0) * weights[kind]
+            combined = group if combined is None else combined + group
+        norm = np.linalg.norm(combined)
+        return (combined / norm if norm else combined).tolist()
+
+    async def _get_term_vectors(self, keys: List[TermKey], db: Session) -> Optional[Dict[TermKey, np.ndarray]]:
+        """Vectors for every key from model_id, or None if the provider answered with another model."""
+        model_id = self.embedding_service.model_id
+        vectors = {}
+        missing = []
+        for key in keys:
+            vector = self._cache.get(key)
+            if vector is None:
+                missing.append(key)
+            else:
+                self._cache.move_to_end(key)
+                vectors[key] = vector
+
+        if missing:
+            rows = db.query(TermEmbedding).filter(
+                TermEmbedding.model == model_id,
+                tuple_(TermEmbedding.kind, TermEmbedding.term).in_(missing)
+            )
+            for row in rows:
+                key = (row.kind, row.term)
+                vectors[key] = np.frombuffer(row.vector, dtype=np.float32)
+                self._remember(key, vectors[key])
+            missing = [key for key in missing if key not in vectors]
+
+        if missing:
+            texts = [TERM_TEMPLATES[kind].format(term) for kind, term in missing]
+            embeddings, embedded_model = await self.embedding_service.get_batch_embeddings_with_model(texts)
+            self.provider_calls += 1
+            metrics.inc("profile_term_embeddings_total", len(missing))
+            if embedded_model != model_id:
+                # A fallback provider answered; its vectors may not even have the vocabulary's dimension
+                logger.warning(f"Term embeddings came from {embedded_model}, not {model_id}; not composing the profile")
+                return None
+            new_vectors = {key: np.asarray(embedding, dtype=np.float32) for key, embedding in zip(missing, embeddings)}
+            vectors.update(new_vectors)
+            for key, vector in new_vectors.items():
+                self._remember(key, vector)
+            self._store(new_vectors, model_id)
+
+        metrics.inc("profile_term_lookups_total", len(keys))
+        return vectors
+
+    def _remember(self, key: TermKey, vector: np.ndarray):
+        self._cache[key] = vector
+        self._cache.move_to_end(key)
+        while len(self._cache) > settings.PROFILE_TERM_CACHE_SIZE:
+            self._cache.popitem(last=False)
+
+    def _store(self, vectors: Dict[TermKey, np.ndarray], model_id: str):
+        """Add new terms to the vocabulary. Requests may run on a read replica, so this uses the primary."""
+        db = SessionLocal()
+        try:
+            db.add_all(
+                TermEmbedding(kind=kind, term=term, model=model_id, vector=vector.tobytes())
+                for (kind, term), vector in vectors.items()
+            )
+            db.commit()
+        except IntegrityError:
+            # Another worker stored the same terms first
+            db.rollback()
+        except Exception as e:
+            logger.warning(f"Error storing term embeddings: {e}")
+            db.rollback()
+        finally:
+            db.close()
+
+@lru_cache()
+def get_profile_embedding_service() -> ProfileEmbeddingService:
+    """Process-wide ProfileEmbeddingService sharing one term cache."""
+    return ProfileEmbeddingService(get_embedding_service())
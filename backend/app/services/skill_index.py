@@ -0,0 +1,129 @@
+import heapq
+import logging
+import threading
+from bisect import bisect_left, insort
+from typing import List, Dict, Any, Iterable, Optional
+from app.core.database import ReadSessionLocal
+from app.core.text import normalize_term
+from app.models.database import JobRole
+from app.services.index_snapshot import snapshot_manager
+
+logger = logging.getLogger(__name__)
+
+# Suggestion lists cached per (prefix, limit); cleared whenever the vocabulary changes
+SUGGESTION_CACHE_SIZE = 4096
+
+class SkillPrefixIndex:
+    """
+    Sorted array of normalized skill names with per-skill job counts.
+    A prefix maps to a contiguous slice found with two bisects; the slice is
+    ranked by job count, so lookups never touch the database.
+    """
+
+    def __init__(self):
+        self._keys: List[str] = []
+        self._counts: Dict[str, int] = {}
+        self._names: Dict[str, str] = {}
+        self._cache: Dict[tuple, List[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self.source_version: Optional[str] = None
+        self.loaded = False
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def rebuild(self, skills: Dict[str, Dict[str, Any]], source_version: str = None):
+        """Replace the vocabulary with {normalized: {"name": ..., "count": ...}}."""
+        keys = sorted(skills)
+        counts = {key: skills[key]["count"] for key in keys}
+        names = {key: skills[key]["name"] for key in keys}
+        with self._lock:
+            self._keys, self._counts, self._names = keys, counts, names
+            self._cache = {}
+            self.source_version = source_version
+            self.loaded = True
+
+    def add_skills(self, skills: Iterable[str]):
+        """Count one more job for each skill, adding new skills to the vocabulary."""
+        with self._lock:
+            for skill in skills:
+                key = normalize_term(skill)
+                if not key:
+                    continue
+                if key not in self._counts:
+                    insort(self._keys, key)
+                    self._counts[key] = 0
+                    self._names[key] = skill.strip()
+                self._counts[key] += 1
+            self._cache = {}
+
+    def remove_skills(self, skills: Iterable[str]):
+        """Count one fewer job for each skill, dropping skills no job requires any more."""
+        with self._lock:
+            for skill in skills:
+                key = normalize_term(skill)
+                if key not in self._counts:
+                    continue
+                self._counts[key] -= 1
+                if self._counts[key] <= 0:
+                    del self._keys[bisect_left(self._keys, key)]
+                    del self._counts[key]
+                    del self._names[key]
+            self._cache = {}
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+        key = normalize_term(prefix)
+        cache_key = (key, limit)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        keys, counts = self._keys, self._counts
+        start = bisect_left(keys, key)
+        end = bisect_left(keys, key + "\uffff")
+        matches = heapq.nsmallest(limit, keys[start:end], key=lambda skill: (-counts[skill], skill))
+        suggestions = [{"skill": self._names[skill], "job_count": counts[skill]} for skill in matches]
+
+        if len(self._cache) >= SUGGESTION_CACHE_SIZE:
+            self._cache = {}
+        self._cache[cache_key] = suggestions
+        return suggestions
+
+skill_index = SkillPrefixIndex()
+
+def _skills_from_database() -> Dict[str, Dict[str, Any]]:
+    skills: Dict[str, Dict[str, Any]] = {}
+    db = ReadSessionLocal()
+    try:
+        for (required_skills,) in db.query(JobRole.required_skills).yield_per(1000):
+            for skill in required_skills or []:
+                entry = skills.setdefault(normalize_term(skill), {"name": skill.strip(), "count": 0})
+                entry["count"] += 1
+    finally:
+        db.close()
+    return skills
+
+def get_skill_index() -> SkillPrefixIndex:
+    """
+    The process-wide index, loaded on first use. When an index snapshot is
+    published, its skill vocabulary replaces the local one, so every worker
+    converges on the same counts.
+    """
+    snapshot = snapshot_manager.current()
+    if snapshot is not None and snapshot.version != skill_index.source_version:
+        skill_index.rebuild(snapshot.skills, source_version=snapshot.version)
+        logger.info(f"Loaded {len(skill_index)} skills from snapshot {snapshot.version}")
+    elif not skill_index.loaded:
+        skill_index.rebuild(_skills_from_database())
+        logger.info(f"Loaded {len(skill_index)} skills from the database")
+    return skill_index
+
+def refresh_skill_index():
+    """
+    Reload the vocabulary from the database when no index snapshot supplies
+    it, picking up jobs created or deleted through other workers.
+    """
+    if snapshot_manager.current() is not None:
+        return
+    skill_index.rebuild(_skills_from_database())
+    logger.info(f"Reloaded {len(skill_index)} skills from the database")
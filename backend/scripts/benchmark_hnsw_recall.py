@@ -0,0 +1,109 @@
+import argparse
+import time
+import numpy as np
+from app.core.config import settings
+from app.services.hnsw_index import HnswIndex
+from app.services.index_snapshot import SnapshotManager
+
+# Experience levels assigned to synthetic vectors
+SYNTHETIC_LEVELS = ["entry", "mid", "senior"]
+
+def load_vectors(snapshot_dir: str, synthetic: int, dim: int, seed: int):
+    """Job vectors and experience levels from the current snapshot, or clustered random vectors for scale tests."""
+    if synthetic:
+        rng = np.random.default_rng(seed)
+        centers = rng.normal(size=(max(synthetic // 100, 1), dim)).astype(np.float32)
+        vectors = centers[rng.integers(len(centers), size=synthetic)] + 0.5 * rng.normal(size=(synthetic, dim)).astype(np.float32)
+        levels = np.asarray(SYNTHETIC_LEVELS)[rng.integers(len(SYNTHETIC_LEVELS), size=synthetic)]
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True), np.arange(synthetic, dtype=np.int64), levels
+    snapshot = SnapshotManager(snapshot_dir, refresh_seconds=0).current()
+    if snapshot is None:
+        return None, None, None
+    levels = np.asarray(snapshot.attribute_values["experience_level"])[np.asarray(snapshot.attribute_codes["experience_level"])]
+    return np.asarray(snapshot.vectors), np.asarray(snapshot.job_ids), levels
+
+def percentile_ms(seconds, q: float) -> float:
+    return float(np.percentile(seconds, q) * 1000)
+
+def exact_top_k(indexed_vectors: np.ndarray, indexed_ids: np.ndarray, query: np.ndarray, top_k: int, mask: np.ndarray = None):
+    scores = indexed_vectors @ query
+    if mask is not None:
+        scores = np.where(mask, scores, -np.inf)
+    top = np.argpartition(-scores, top_k - 1)[:top_k]
+    return {str(job_id) for job_id, score in zip(indexed_ids[top], scores[top]) if score > -np.inf}
+
+def benchmark(snapshot_dir: str, synthetic: int, dim: int, queries: int, top_k: int,
+              m: int, ef_construction: int, ef_search_values, filter_levels, seed: int):
+    """
+    Recall@k and latency of HNSW search against exact search over the same
+    vectors, unfiltered and with the experience_level $in filter that
+    analyze-skills sends.
+    """
+    vectors, job_ids, levels = load_vectors(snapshot_dir, synthetic, dim, seed)
+    if vectors is None:
+        print("No index snapshot found. Run scripts/build_index_snapshot.py first, or pass --synthetic N.")
+        return
+    
+    # Held-out queries: sampled vectors are searched for, not indexed
+    rng = np.random.default_rng(seed)
+    order = rng.permutation(len(vectors))
+    query_rows, index_rows = order[:queries], np.sort(order[queries:])
+    if len(index_rows) < top_k:
+        print(f"Need more than {queries + top_k} vectors, got {len(vectors)}")
+        return
+    indexed_vectors, indexed_ids, indexed_levels = vectors[index_rows], job_ids[index_rows], levels[index_rows]
+    
+    start = time.perf_counter()
+    index = HnswIndex.create(vectors.shape[1], m=m, ef_construction=ef_construction, max_elements=len(index_rows))
+    index.add(
+        [int(job_id) for job_id in indexed_ids], indexed_vectors,
+        [{"experience_level": str(level)} for level in indexed_levels]
+    )
+    build_seconds = time.perf_counter() - start
+    
+    print(f"Vectors: {len(index_rows)} x {vectors.shape[1]}, queries: {len(query_rows)}, k: {top_k}")
+    print(f"Build: {build_seconds:.1f}s (M={m}, ef_construction={ef_construction})")
+    
+    cases = [("unfiltered", None, None)]
+    if filter_levels:
+        mask = np.isin(indexed_levels, filter_levels)
+        cases.append((f"experience_level in {filter_levels} ({mask.mean():.0%} of jobs)", {"experience_level": {"$in": filter_levels}}, mask))
+    for label, filters, mask in cases:
+        exact, exact_seconds = [], []
+        for row in query_rows:
+            start = time.perf_counter()
+            exact.append(exact_top_k(indexed_vectors, indexed_ids, vectors[row], top_k, mask))
+            exact_seconds.append(time.perf_counter() - start)
+        
+        print(f"\n{label}")
+        print(f"Exact search: p50 {percentile_ms(exact_seconds, 50):.2f} ms, p99 {percentile_ms(exact_seconds, 99):.2f} ms")
+        print(f"{'ef_search':>10} {'recall@' + str(top_k):>10} {'p50 ms':>8} {'p99 ms':>8}")
+        for ef_search in ef_search_values:
+            recalls, seconds = [], []
+            index.set_ef_search(ef_search)
+            for row, expected in zip(query_rows, exact):
+                start = time.perf_counter()
+                matches = index.search(vectors[row], top_k=top_k, filters=filters)
+                seconds.append(time.perf_counter() - start)
+                recalls.append(len(expected & {match['job_id'] for match in matches}) / max(len(expected), 1))
+            print(f"{ef_search:>10} {np.mean(recalls):>10.4f} {percentile_ms(seconds, 50):>8.2f} {percentile_ms(seconds, 99):>8.2f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure HNSW recall@k and latency against exact search")
+    parser.add_argument("--snapshot-dir", default=settings.SNAPSHOT_DIR, help="Directory holding snapshot versions")
+    parser.add_argument("--synthetic", type=int, default=0, help="Use N synthetic vectors instead of the snapshot")
+    parser.add_argument("--dim", type=int, default=768, help="Dimension of synthetic vectors")
+    parser.add_argument("--queries", type=int, default=200, help="Held-out vectors used as queries")
+    parser.add_argument("--top-k", type=int, default=10, help="k for recall@k")
+    parser.add_argument("--m", type=int, default=settings.HNSW_M, help="Graph links per node")
+    parser.add_argument("--ef-construction", type=int, default=settings.HNSW_EF_CONSTRUCTION, help="Candidate list size while building")
+    parser.add_argument("--ef-search", default="16,32,64,128,256", help="Comma-separated ef_search values to compare")
+    parser.add_argument("--filter-levels", default="entry,mid", help="Experience levels for the filtered case (empty to skip)")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed for query sampling")
+    args = parser.parse_args()
+    
+    benchmark(
+        args.snapshot_dir, args.synthetic, args.dim, args.queries, args.top_k,
+        args.m, args.ef_construction, [int(value) for value in args.ef_search.split(",")],
+        [level for level in args.filter_levels.split(",") if level], args.seed
+    )
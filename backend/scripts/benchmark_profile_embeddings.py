@@ -0,0 +1,76 @@
+import argparse
+import asyncio
+import random
+import time
+import numpy as np
+from app.core.database import SessionLocal
+from app.models.database import JobRole
+from app.schemas.career import SkillAnalysisRequest
+from app.services.ai_service import get_embedding_service, get_vector_search
+from app.services.career_service import CareerAdvisorService
+from app.services.profile_embedding import get_profile_embedding_service
+
+def sample_profiles(jobs, count: int, seed: int):
+    """Synthetic profiles drawn from the catalog: a few skills, interests and industries each."""
+    rng = random.Random(seed)
+    skills = sorted({skill for job in jobs for skill in job.required_skills})
+    interests = sorted({part.strip() for job in jobs for part in job.career_path.split(">")})
+    industries = sorted({job.industry for job in jobs})
+    for _ in range(count):
+        yield SkillAnalysisRequest(
+            skills=rng.sample(skills, min(len(skills), rng.randint(2, 6))),
+            interests=rng.sample(interests, min(len(interests), rng.randint(0, 2))),
+            experience_level=rng.choice(["entry", "mid", "senior"]),
+            preferred_industries=rng.sample(industries, min(len(industries), rng.randint(0, 1)))
+        )
+
+async def benchmark(count: int, top_k: int, seed: int):
+    """Compare compositional profile vectors with full-text embeddings on the same searches."""
+    db = SessionLocal()
+    try:
+        jobs = db.query(JobRole).all()
+        if not jobs:
+            print("No jobs in the database. Load data first.")
+            return
+        
+        embedding_service = get_embedding_service()
+        profile_service = get_profile_embedding_service()
+        vector_search = get_vector_search()
+        career_service = CareerAdvisorService()
+        
+        overlaps, cosines = [], []
+        text_seconds = compositional_seconds = 0.0
+        for request in sample_profiles(jobs, count, seed):
+            start = time.perf_counter()
+            text_vector = await embedding_service.get_embedding(career_service._create_user_profile_text(request))
+            text_seconds += time.perf_counter() - start
+            
+            start = time.perf_counter()
+            compositional_vector = await profile_service.embed_profile(request, db)
+            compositional_seconds += time.perf_counter() - start
+            
+            text_hits = await vector_search.search_similar_jobs(text_vector, top_k=top_k)
+            compositional_hits = await vector_search.search_similar_jobs(compositional_vector, top_k=top_k)
+            text_ids = {hit['job_id'] for hit in text_hits}
+            compositional_ids = {hit['job_id'] for hit in compositional_hits}
+            overlaps.append(len(text_ids & compositional_ids) / max(len(text_ids), 1))
+            
+            a, b = np.asarray(text_vector), np.asarray(compositional_vector)
+            cosines.append(float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b))))
+        
+        print(f"Profiles: {count}, top_k: {top_k}")
+        print(f"Mean overlap@{top_k}: {np.mean(overlaps):.3f} (min {np.min(overlaps):.3f})")
+        print(f"Mean cosine(text, compositional): {np.mean(cosines):.3f}")
+        print(f"Full-text embedding: {count} provider calls, {text_seconds / count * 1000:.1f} ms/profile")
+        print(f"Compositional: {profile_service.provider_calls} provider calls, {compositional_seconds / count * 1000:.1f} ms/profile")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark compositional vs full-text profile embeddings")
+    parser.add_argument("--profiles", type=int, default=50, help="Number of synthetic profiles")
+    parser.add_argument("--top-k", type=int, default=10, help="Recommendations compared per profile")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed for profile sampling")
+    args = parser.parse_args()
+    
+    asyncio.run(benchmark(args.profiles, args.top_k, args.seed))
@@ -0,0 +1,35 @@
+import argparse
+import logging
+import time
+from app.core.config import settings
+from app.services.hnsw_index import HnswVectorStore, build_from_snapshot, save_index_version
+from app.services.index_snapshot import SnapshotManager
+
+def build_hnsw_index(snapshot_dir: str, index_dir: str, m: int, ef_construction: int):
+    """Build the HNSW index from the current index snapshot, without calling Pinecone."""
+    logging.basicConfig(level=logging.INFO)
+    snapshot = SnapshotManager(snapshot_dir, refresh_seconds=0).current()
+    if snapshot is None:
+        print("No index snapshot found. Run scripts/build_index_snapshot.py first.")
+        return
+    
+    # Hold the writer lock so a running indexing worker cannot save over the new version
+    if not HnswVectorStore(index_dir).acquire_writer():
+        print(f"Another process holds the HNSW writer lock for {index_dir}. Stop the indexing worker first.")
+        return
+    
+    start = time.perf_counter()
+    index = build_from_snapshot(snapshot, m=m, ef_construction=ef_construction)
+    version = save_index_version(index, index_dir)
+    print(f"Published HNSW index {version} with {len(index)} jobs from snapshot {snapshot.version} "
+          f"in {time.perf_counter() - start:.1f}s (M={m}, ef_construction={ef_construction})")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the local HNSW index from the current index snapshot")
+    parser.add_argument("--snapshot-dir", default=settings.SNAPSHOT_DIR, help="Directory holding snapshot versions")
+    parser.add_argument("--index-dir", default=settings.HNSW_INDEX_DIR, help="Directory holding HNSW index versions")
+    parser.add_argument("--m", type=int, default=settings.HNSW_M, help="Graph links per node")
+    parser.add_argument("--ef-construction", type=int, default=settings.HNSW_EF_CONSTRUCTION, help="Candidate list size while building")
+    args = parser.parse_args()
+    
+    build_hnsw_index(args.snapshot_dir, args.index_dir, args.m, args.ef_construction)
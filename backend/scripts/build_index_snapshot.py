@@ -0,0 +1,39 @@
+import argparse
+import asyncio
+import logging
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.ai_service import get_vector_db
+from app.services.index_snapshot import build_snapshot
+
+async def build_index_snapshot(snapshot_dir: str, force: bool, watch: float):
+    """Publish index snapshots for API workers to memory-map, once or on an interval."""
+    logging.basicConfig(level=logging.INFO)
+    vector_db = get_vector_db()
+    
+    while True:
+        db = SessionLocal()
+        try:
+            version = await build_snapshot(db, vector_db, snapshot_dir=snapshot_dir, force=force)
+            if version:
+                print(f"Published snapshot {version}")
+            else:
+                print("Catalog unchanged, snapshot is current")
+        except Exception as e:
+            print(f"Error building snapshot: {e}")
+        finally:
+            db.close()
+        
+        if not watch:
+            break
+        force = False
+        await asyncio.sleep(watch)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build a versioned index snapshot shared by API workers")
+    parser.add_argument("--snapshot-dir", default=settings.SNAPSHOT_DIR, help="Directory holding snapshot versions")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if the catalog is unchanged")
+    parser.add_argument("--watch", type=float, default=0, help="Rebuild every N seconds when the catalog changes")
+    args = parser.parse_args()
+    
+    asyncio.run(build_index_snapshot(args.snapshot_dir, args.force, args.watch))
@@ -0,0 +1,33 @@
+import argparse
+import logging
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.index_snapshot import SnapshotManager
+from app.services.neighbor_service import build_neighbor_table, neighbor_block_size
+
+def build_job_neighbors(snapshot_dir: str, top_n: int, memory_mb: int):
+    """Rebuild the job_neighbors table from the current index snapshot."""
+    logging.basicConfig(level=logging.INFO)
+    snapshot = SnapshotManager(snapshot_dir, refresh_seconds=0).current()
+    if snapshot is None:
+        print("No index snapshot found. Run scripts/build_index_snapshot.py first.")
+        return
+    
+    db = SessionLocal()
+    try:
+        processed = build_neighbor_table(db, snapshot, top_n=top_n, block_size=neighbor_block_size(len(snapshot), memory_mb))
+        print(f"Stored top-{top_n} neighbours for {processed} jobs from snapshot {snapshot.version}")
+    except Exception as e:
+        print(f"Error building neighbours: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute similar jobs for /jobs/{id}/similar")
+    parser.add_argument("--snapshot-dir", default=settings.SNAPSHOT_DIR, help="Directory holding snapshot versions")
+    parser.add_argument("--top-n", type=int, default=settings.NEIGHBORS_TOP_N, help="Neighbours stored per job")
+    parser.add_argument("--memory-mb", type=int, default=settings.NEIGHBORS_BUILD_MEMORY_MB, help="Working memory for each block of scores")
+    args = parser.parse_args()
+    
+    build_job_neighbors(args.snapshot_dir, args.top_n, args.memory_mb)
@@ -3,7 +3,9 @@ import pandas as pd
 from sqlalchemy.orm import Session
 from app.core.database import SessionLocal, engine
 from app.models.database import Base, JobRole
-from app.services.ai_service import EmbeddingService, VectorDatabaseService
+from app.services.ai_service import EmbeddingService, get_vector_db
+from app.services.indexing_service import INDEXING_PENDING, enqueue_job_indexing, process_outbox_batch
+from app.services.job_skills import link_job_skills
 
 async def load_sample_data():
     """Load sample job data into database and vector store."""
@@ -16,17 +18,18 @@ async def load_sample_data():
     
     # Initialize services
     embedding_service = EmbeddingService()
-    vector_db = VectorDatabaseService()
+    vector_db = get_vector_db()
     
     db = SessionLocal()
     
     try:
+        jobs = []
         for _, row in df.iterrows():
             # Parse skills from comma-separated string
             skills = [skill.strip() for skill in row['required_skills'].split(',')]
             
             # Create job record
-            job = JobRole(
+            jobs.append(JobRole(
                 title=row['job_title'],
                 description=row['description'],
                 required_skills=skills,
@@ -34,40 +37,20 @@ async def load_sample_data():
                 experience_level=row['experience_level'],
                 salary_range=row['salary_range'],
                 location=row['location'],
-                industry=row['industry']
-            )
-            
-            db.add(job)
-            db.commit()
-            db.refresh(job)
-            
-            # Create text for embedding
-            job_text = f"{job.title}. {job.description}. Required skills: {', '.join(job.required_skills)}. Industry: {job.industry}"
-            
-            # Get embedding
-            print(f"Getting embedding for: {job.title}")
-            embedding = await embedding_service.get_embedding(job_text)
-            
-            # Store in vector database
-            metadata = {
-                "title": job.title,
-                "industry": job.industry,
-                "experience_level": job.experience_level,
-                "career_path": job.career_path,
-                "location": job.location
-            }
-            
-            await vector_db.upsert_job_embedding(
-                job_id=str(job.id),
-                embedding=embedding,
-                metadata=metadata
-            )
-            
-            # Update job with embedding ID
-            job.embedding_id = str(job.id)
-            db.commit()
-            
-            print(f"Processed: {job.title}")
+                industry=row['industry'],
+                indexing_status=INDEXING_PENDING
+            ))
+        
+        db.add_all(jobs)
+        db.flush()
+        link_job_skills(db, jobs)
+        enqueue_job_indexing(db, [job.id for job in jobs])
+        db.commit()
+        print(f"Inserted {len(jobs)} jobs")
+        
+        # Embed and upsert in batches through the indexing outbox
+        while await process_outbox_batch(db, embedding_service, vector_db):
+            print("Processed embedding batch")
             
     except Exception as e:
         print(f"Error loading data: {e}")
@@ -0,0 +1,39 @@
+from sqlalchemy import text
+from app.core.database import engine, SessionLocal
+from app.models.database import Base
+from app.services.job_skills import backfill_job_skills
+
+# Columns added after the initial schema. create_all() only creates missing
+# tables, so existing databases get these via ALTER TABLE.
+COLUMN_MIGRATIONS = [
+    "ALTER TABLE job_roles ADD COLUMN IF NOT EXISTS indexing_status VARCHAR NOT NULL DEFAULT 'pending'",
+    "CREATE INDEX IF NOT EXISTS ix_job_roles_indexing_status ON job_roles (indexing_status)",
+    "ALTER TABLE job_roles ADD COLUMN IF NOT EXISTS embedding_fingerprint VARCHAR(64)",
+    "ALTER TABLE job_roles ADD COLUMN IF NOT EXISTS embedding_model VARCHAR",
+]
+
+BACKFILLS = [
+    # Jobs embedded before the outbox existed are already in the vector index
+    "UPDATE job_roles SET indexing_status = 'indexed' WHERE embedding_id IS NOT NULL AND indexing_status = 'pending'",
+]
+
+def migrate():
+    """Bring an existing database up to the current schema."""
+    Base.metadata.create_all(bind=engine)
+    
+    with engine.begin() as conn:
+        for statement in COLUMN_MIGRATIONS + BACKFILLS:
+            print(f"Running: {statement}")
+            conn.execute(text(statement))
+    
+    # Normalized skills for jobs created before the job_skills table existed
+    db = SessionLocal()
+    try:
+        print(f"Backfilled job_skills for {backfill_job_skills(db)} jobs")
+    finally:
+        db.close()
+    
+    print("Migration completed!")
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,48 @@
+import argparse
+import asyncio
+from app.core.database import SessionLocal
+from app.services.ai_service import EmbeddingService, get_vector_db
+from app.services.indexing_service import find_stale_job_ids, enqueue_stale_jobs, process_outbox_batch, prune_orphan_vectors
+
+async def reindex_jobs(batch_size: int, prune: bool, dry_run: bool):
+    """Re-embed only stale jobs (including jobs whose vector is missing from the store) and prune vectors for deleted jobs."""
+    embedding_service = EmbeddingService()
+    vector_db = get_vector_db()
+    model_id = embedding_service.model_id
+    
+    db = SessionLocal()
+    
+    try:
+        vector_ids = set(await vector_db.list_job_ids())
+        if dry_run:
+            stale_ids = find_stale_job_ids(db, model_id, vector_ids)
+            print(f"{len(stale_ids)} jobs need re-embedding with {model_id}")
+        else:
+            queued_ids = enqueue_stale_jobs(db, model_id, vector_ids)
+            print(f"Queued {len(queued_ids)} stale jobs for re-embedding with {model_id}")
+            
+            # Drain the outbox here; a running indexing worker shares the work safely
+            while await process_outbox_batch(db, embedding_service, vector_db, batch_size):
+                print("Processed embedding batch")
+        
+        if prune:
+            orphan_ids = await prune_orphan_vectors(db, vector_db, dry_run=dry_run)
+            action = "Would prune" if dry_run else "Pruned"
+            print(f"{action} {len(orphan_ids)} orphaned vectors")
+            
+    except Exception as e:
+        print(f"Error reindexing jobs: {e}")
+        db.rollback()
+    finally:
+        db.close()
+    
+    print("Reindex completed!")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Incrementally rebuild the job vector index")
+    parser.add_argument("--batch-size", type=int, default=100, help="Jobs per embedding batch")
+    parser.add_argument("--no-prune", action="store_true", help="Skip deleting vectors of removed jobs")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing")
+    args = parser.parse_args()
+    
+    asyncio.run(reindex_jobs(args.batch_size, not args.no_prune, args.dry_run))
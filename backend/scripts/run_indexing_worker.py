@@ -0,0 +1,16 @@
+import asyncio
+import logging
+from app.services.indexing_service import IndexingWorker
+
+async def run_indexing_worker():
+    """Drain the job index outbox outside the API process."""
+    logging.basicConfig(level=logging.INFO)
+    worker = IndexingWorker()
+    print("Indexing worker running (Ctrl+C to stop)...")
+    await worker.run()
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(run_indexing_worker())
+    except KeyboardInterrupt:
+        print("Indexing worker stopped")
@@ -0,0 +1,26 @@
+import os
+import sys
+import tempfile
+import pytest
+
+# Settings are read at import time: point the app at a throwaway SQLite
+# database and keep background workers and external services out of tests
+_tmp_dir = tempfile.mkdtemp(prefix="career-advisor-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_tmp_dir, 'test.db')}")
+os.environ.setdefault("INDEXING_WORKER_ENABLED", "false")
+os.environ.setdefault("SNAPSHOT_DIR", os.path.join(_tmp_dir, "index_snapshots"))
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import SessionLocal, engine
+from app.models.database import Base
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
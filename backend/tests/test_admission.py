@@ -0,0 +1,112 @@
+import asyncio
+import pytest
+from app.core.admission import (
+    SHED_QUEUE_FULL, SHED_WAIT_TIMEOUT, AdmissionControlMiddleware, AdmissionController, AdmissionLane
+)
+
+def _lane(max_concurrency: int = 1, max_queue: int = 1, max_wait_seconds: float = 0.05) -> AdmissionLane:
+    return AdmissionLane("test", max_concurrency=max_concurrency, max_queue=max_queue, max_wait_seconds=max_wait_seconds)
+
+def _middleware(app, lane: AdmissionLane) -> AdmissionControlMiddleware:
+    return AdmissionControlMiddleware(app, AdmissionController([], lane))
+
+async def _call(middleware: AdmissionControlMiddleware, path: str = "/api/v1/jobs/"):
+    """Run one HTTP request through the middleware; returns (status, headers)."""
+    messages = []
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    async def send(message):
+        messages.append(message)
+    scope = {"type": "http", "method": "GET", "path": path, "headers": [], "query_string": b""}
+    await middleware(scope, receive, send)
+    start = next(message for message in messages if message["type"] == "http.response.start")
+    return start["status"], {name.decode(): value.decode() for name, value in start["headers"]}
+
+async def _ok(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+def _blocking_app(release: asyncio.Event):
+    async def app(scope, receive, send):
+        await release.wait()
+        await _ok(scope, receive, send)
+    return app
+
+def test_lane_admits_up_to_concurrency_then_queues():
+    async def run():
+        lane = _lane(max_concurrency=2, max_queue=1)
+        assert await lane.acquire() is None
+        assert await lane.acquire() is None
+        assert lane.in_flight == 2
+        waiter = asyncio.create_task(lane.acquire())
+        await asyncio.sleep(0)
+        assert lane.waiting == 1
+        lane.release()
+        assert await waiter is None
+        assert (lane.in_flight, lane.waiting) == (2, 0)
+    asyncio.run(run())
+
+def test_full_queue_is_shed_with_503():
+    async def run():
+        release = asyncio.Event()
+        lane = _lane(max_concurrency=1, max_queue=0, max_wait_seconds=2.5)
+        middleware = _middleware(_blocking_app(release), lane)
+        first = asyncio.create_task(_call(middleware))
+        await asyncio.sleep(0)
+
+        status_code, headers = await _call(middleware)
+        release.set()
+        assert (await first)[0] == 200
+        return status_code, headers
+    status_code, headers = asyncio.run(run())
+    assert status_code == 503
+    assert headers["retry-after"] == "3"
+
+def test_wait_timeout_is_shed_with_429():
+    async def run():
+        release = asyncio.Event()
+        lane = _lane(max_concurrency=1, max_queue=1, max_wait_seconds=0.05)
+        middleware = _middleware(_blocking_app(release), lane)
+        first = asyncio.create_task(_call(middleware))
+        await asyncio.sleep(0)
+
+        status_code, headers = await _call(middleware)
+        assert lane.waiting == 0
+        release.set()
+        await first
+        return status_code, headers
+    status_code, headers = asyncio.run(run())
+    assert status_code == 429
+    assert headers["retry-after"] == "1"
+
+def test_lane_reports_shed_reasons():
+    async def run():
+        lane = _lane(max_concurrency=1, max_queue=1, max_wait_seconds=0.01)
+        await lane.acquire()
+        waiter = asyncio.create_task(lane.acquire())
+        await asyncio.sleep(0)
+        assert await lane.acquire() == SHED_QUEUE_FULL
+        assert await waiter == SHED_WAIT_TIMEOUT
+    asyncio.run(run())
+
+def test_slot_released_when_app_raises():
+    async def failing_app(scope, receive, send):
+        raise RuntimeError("boom")
+
+    async def run():
+        lane = _lane(max_concurrency=1)
+        middleware = _middleware(failing_app, lane)
+        with pytest.raises(RuntimeError):
+            await _call(middleware)
+        assert lane.in_flight == 0
+        # The slot is free again, so the next request is admitted without waiting
+        assert await lane.acquire() is None
+    asyncio.run(run())
+
+def test_exempt_paths_bypass_lanes():
+    async def run():
+        lane = _lane(max_concurrency=1, max_queue=0)
+        await lane.acquire()
+        middleware = AdmissionControlMiddleware(_ok, AdmissionController([], lane, exempt_paths=("/health",)))
+        return await _call(middleware, "/health")
+    assert asyncio.run(run())[0] == 200
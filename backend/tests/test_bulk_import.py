@@ -0,0 +1,117 @@
+import asyncio
+import json
+import pytest
+from app.models.database import JobIndexOutbox, JobRole
+from app.services.bulk_import import BulkImportError, import_jobs, iter_csv_rows, iter_lines, iter_ndjson_rows, parse_rows
+
+JOB = {
+    "title": "Data Analyst",
+    "description": "Analyse data",
+    "required_skills": ["SQL", "Python"],
+    "career_path": "Analyst > Senior Analyst",
+    "experience_level": "entry",
+    "industry": "Technology"
+}
+
+async def _chunks(data: bytes, size: int = 5):
+    # Small chunks so lines and quoted fields straddle chunk boundaries
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+def _collect(rows):
+    async def collect():
+        return [row async for row in rows]
+    return asyncio.run(collect())
+
+def _csv_rows(data: bytes, max_line_bytes: int = None):
+    return _collect(iter_csv_rows(iter_lines(_chunks(data), max_line_bytes), max_line_bytes))
+
+def _ndjson(*rows) -> bytes:
+    return "\n".join(row if isinstance(row, str) else json.dumps(row) for row in rows).encode()
+
+def test_iter_lines_numbers_lines_and_strips_crlf():
+    assert _collect(iter_lines(_chunks(b"a\r\nbb\n\nccc"))) == [(1, b"a"), (2, b"bb"), (3, b""), (4, b"ccc")]
+
+def test_iter_lines_rejects_over_limit_line():
+    with pytest.raises(BulkImportError, match="Line 2 exceeds 8 bytes"):
+        _collect(iter_lines(_chunks(b"short\n" + b"x" * 20), max_line_bytes=8))
+
+def test_ndjson_rows_report_invalid_lines():
+    rows = _collect(iter_ndjson_rows(iter_lines(_chunks(_ndjson(JOB, "", "{not json", "[1, 2]", JOB)))))
+    assert [(line, error is None) for line, _, error in rows] == [(1, True), (3, False), (4, False), (5, True)]
+    assert rows[1][2].startswith("Invalid JSON")
+    assert rows[2][2] == "Expected a JSON object"
+
+def test_csv_quoted_field_spans_lines():
+    rows = _csv_rows(b'title,description\nA,"line one\nline two"\nB,single\n')
+    assert rows == [
+        (2, {"title": "A", "description": "line one\nline two"}, None),
+        (4, {"title": "B", "description": "single"}, None)
+    ]
+
+def test_csv_stray_quote_in_unquoted_field():
+    rows = _csv_rows(b'title,description\nLaptop,15" screen\nMonitor,"27"" screen"\nNext,row\n')
+    assert [row for _, row, _ in rows] == [
+        {"title": "Laptop", "description": '15" screen'},
+        {"title": "Monitor", "description": '27" screen'},
+        {"title": "Next", "description": "row"}
+    ]
+
+def test_csv_malformed_quote_fails_only_its_row():
+    rows = _csv_rows(b'title,description\nA,"x"y\nB,ok\n')
+    assert rows[0][0] == 2 and rows[0][2].startswith("Invalid CSV")
+    assert rows[1] == (3, {"title": "B", "description": "ok"}, None)
+
+def test_csv_maps_aliases_and_splits_skills():
+    rows = _csv_rows('﻿job_title,required_skills\nAnalyst,"SQL, Python"\n'.encode())
+    assert rows == [(2, {"title": "Analyst", "required_skills": ["SQL", "Python"]}, None)]
+
+def test_csv_column_count_and_invalid_utf8():
+    rows = _csv_rows(b"title,description\nA\nB,\xff\xfe\nC,ok\n")
+    assert rows == [
+        (2, None, "Expected 2 columns, got 1"),
+        (3, None, "Invalid UTF-8 on line 3"),
+        (4, {"title": "C", "description": "ok"}, None)
+    ]
+
+def test_csv_record_over_limit_aborts_after_earlier_rows():
+    data = b'title,description\nA,ok\nB,"' + b"x\n" * 50 + b'"\n'
+    rows = []
+    async def collect():
+        async for row in iter_csv_rows(iter_lines(_chunks(data), 64), 64):
+            rows.append(row)
+    with pytest.raises(BulkImportError, match="Record starting on line 3 exceeds 64 bytes"):
+        asyncio.run(collect())
+    assert rows == [(2, {"title": "A", "description": "ok"}, None)]
+
+def test_import_commits_one_transaction_per_batch(db, monkeypatch):
+    commits = []
+    commit = db.commit
+    monkeypatch.setattr(db, "commit", lambda: commits.append(1) or commit())
+
+    result = asyncio.run(import_jobs(db, parse_rows(_chunks(_ndjson(*[JOB] * 5)), "ndjson"), batch_size=2))
+
+    assert (result["received"], result["created"], result["failed"]) == (5, 5, 0)
+    assert len(commits) == 3
+    assert db.query(JobRole).count() == 5
+    assert db.query(JobIndexOutbox).count() == 5
+
+def test_import_truncates_errors(db):
+    invalid = dict(JOB, title=None)
+    result = asyncio.run(import_jobs(
+        db, parse_rows(_chunks(_ndjson(*[invalid] * 4, JOB)), "ndjson"), max_errors=2
+    ))
+
+    assert (result["received"], result["created"], result["failed"]) == (5, 1, 4)
+    assert [error["line"] for error in result["errors"]] == [1, 2]
+    assert result["errors_truncated"] is True
+    assert result["aborted"] is None
+
+def test_import_keeps_rows_before_unreadable_line(db):
+    data = _ndjson(JOB, JOB) + b"\n" + b"x" * 1000
+    rows = iter_ndjson_rows(iter_lines(_chunks(data), 512))
+
+    result = asyncio.run(import_jobs(db, rows, batch_size=1))
+
+    assert result["created"] == 2
+    assert result["aborted"] == "Line 3 exceeds 512 bytes"
@@ -0,0 +1,94 @@
+from types import SimpleNamespace
+from app.services.facet_index import FacetIndex
+
+def _job(job_id, industry, experience_level, location=None, required_skills=()):
+    return SimpleNamespace(
+        id=job_id, industry=industry, experience_level=experience_level,
+        location=location, required_skills=list(required_skills)
+    )
+
+def _index(*jobs) -> FacetIndex:
+    index = FacetIndex()
+    index.rebuild(
+        (job.id, {"industry": job.industry, "experience_level": job.experience_level, "location": job.location},
+         job.required_skills)
+        for job in jobs
+    )
+    return index
+
+JOBS = [
+    _job(1, "Tech", "entry", "Remote", ["Python", "SQL"]),
+    _job(2, "Tech", "senior", "London", ["Python"]),
+    _job(3, "Finance", "entry", None, ["SQL", "Excel"]),
+    _job(4, "Finance", "senior", "London", []),
+]
+
+def test_counts_without_filters():
+    counts = _index(*JOBS).counts({})
+    assert counts["total"] == 4
+    assert counts["facets"] == {
+        "industry": {"Tech": 2, "Finance": 2},
+        "experience_level": {"entry": 2, "senior": 2},
+        "location": {"Remote": 1, "London": 2}
+    }
+
+def test_facet_leaves_its_own_filter_out():
+    counts = _index(*JOBS).counts({"industry": "Tech", "experience_level": None})
+    assert counts["total"] == 2
+    # Industry counts ignore the industry filter so the alternatives stay visible
+    assert counts["facets"]["industry"] == {"Tech": 2, "Finance": 2}
+    assert counts["facets"]["experience_level"] == {"entry": 1, "senior": 1}
+
+def test_combined_filters_intersect():
+    counts = _index(*JOBS).counts({"industry": "Finance", "experience_level": "senior"})
+    assert counts["total"] == 1
+    assert counts["facets"]["industry"] == {"Tech": 1, "Finance": 1}
+    assert counts["facets"]["experience_level"] == {"entry": 1, "senior": 1}
+    assert counts["facets"]["location"] == {"London": 1}
+
+def test_unknown_filter_value_matches_nothing():
+    counts = _index(*JOBS).counts({"industry": "Retail"})
+    assert counts["total"] == 0
+    assert counts["facets"]["experience_level"] == {}
+
+def test_skills_filter_any_and_all():
+    index = _index(*JOBS)
+    assert index.counts({}, skills=["python", " SQL "])["total"] == 3
+    counts = index.counts({"industry": None}, skills=["Python", "sql"], skills_match="all")
+    assert counts["total"] == 1
+    assert counts["facets"]["industry"] == {"Tech": 1}
+    assert index.counts({}, skills=["Rust"])["total"] == 0
+
+def test_add_and_remove_job():
+    index = _index(*JOBS)
+    index.add_job(_job(5, "Retail", "entry", None, ["Excel"]))
+    counts = index.counts({}, skills=["excel"])
+    assert counts["total"] == 2
+    assert counts["facets"]["industry"] == {"Finance": 1, "Retail": 1}
+
+    index.remove_job(5)
+    index.remove_job(2)
+    index.remove_job(99)
+    counts = index.counts({})
+    assert len(index) == 3
+    assert counts["facets"]["industry"] == {"Tech": 1, "Finance": 2}
+    assert counts["facets"]["experience_level"] == {"entry": 2, "senior": 1}
+    assert index.counts({}, skills=["excel"])["total"] == 1
+
+def test_add_job_replaces_previous_values():
+    index = _index(*JOBS)
+    index.add_job(_job(1, "Finance", "senior", "London", ["Excel"]))
+    counts = index.counts({})
+    assert counts["facets"]["industry"] == {"Tech": 1, "Finance": 3}
+    assert counts["facets"]["location"] == {"London": 3}
+    assert index.counts({}, skills=["python"])["total"] == 1
+
+def test_rebuild_replaces_contents():
+    index = _index(*JOBS)
+    index.rebuild([(7, {"industry": "Retail", "experience_level": "entry", "location": None}, ["Sales"])])
+    assert index.loaded
+    assert index.counts({}) == {
+        "total": 1,
+        "facets": {"industry": {"Retail": 1}, "experience_level": {"entry": 1}, "location": {}}
+    }
+    assert index.counts({}, skills=["python"])["total"] == 0
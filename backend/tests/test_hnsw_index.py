@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from app.services import hnsw_index
+from app.services.hnsw_index import HnswIndex
+
+LEVELS = ["entry", "mid", "senior"]
+
+@pytest.fixture(scope="module")
+def index_data():
+    rng = np.random.default_rng(3)
+    vectors = rng.normal(size=(3000, 16)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    levels = [LEVELS[i % 3] for i in range(len(vectors))]
+    industries = ["Rare" if i % 100 == 0 else "Tech" for i in range(len(vectors))]
+    index = HnswIndex.create(16, max_elements=len(vectors))
+    index.add(
+        list(range(len(vectors))), vectors,
+        [{"experience_level": level, "industry": industry} for level, industry in zip(levels, industries)]
+    )
+    return index, vectors, np.asarray(levels), np.asarray(industries)
+
+def _exact(vectors, query, mask, k):
+    scores = np.where(mask, vectors @ query, -np.inf)
+    return {str(i) for i in np.argsort(-scores)[:k] if scores[i] > -np.inf}
+
+@pytest.mark.parametrize("filters", [
+    {"experience_level": {"$in": ["entry", "mid"]}},
+    {"experience_level": "senior"},
+    {"industry": "Rare"},
+    {"industry": "Rare", "experience_level": "mid"},
+])
+def test_filtered_search_returns_only_matches(index_data, filters):
+    index, vectors, levels, industries = index_data
+    mask = np.ones(len(vectors), dtype=bool)
+    for field, values in (("experience_level", levels), ("industry", industries)):
+        if field in filters:
+            condition = filters[field]
+            mask &= np.isin(values, condition["$in"] if isinstance(condition, dict) else [condition])
+    query = vectors[7]
+
+    matches = index.search(query, top_k=10, filters=filters)
+
+    assert len(matches) == min(10, mask.sum())
+    assert all(mask[int(match["job_id"])] for match in matches)
+    assert len({match["job_id"] for match in matches} & _exact(vectors, query, mask, 10)) >= 8
+
+def test_post_filter_falls_back_when_matches_run_short(index_data, monkeypatch):
+    index, vectors, levels, _ = index_data
+    # Too few neighbours to hold k matches: the filter callback path answers instead
+    monkeypatch.setattr(hnsw_index, "FILTER_OVERSAMPLE", 0.1)
+    matches = index.search(vectors[0], top_k=10, filters={"experience_level": "mid"})
+    assert len(matches) == 10
+    assert all(levels[int(match["job_id"])] == "mid" for match in matches)
+
+def test_unknown_filter_value_and_field(index_data):
+    index, vectors, _, _ = index_data
+    assert index.search(vectors[0], top_k=10, filters={"experience_level": "executive"}) == []
+    with pytest.raises(ValueError):
+        index.search(vectors[0], top_k=10, filters={"salary": "high"})
+
+def test_deleted_jobs_are_not_returned():
+    rng = np.random.default_rng(5)
+    index = HnswIndex.create(8, max_elements=4)
+    vectors = rng.normal(size=(50, 8)).astype(np.float32)
+    index.add(list(range(50)), vectors, [{"experience_level": "entry"}] * 50)
+    index.delete([0, 1, 2])
+
+    matches = index.search(vectors[0], top_k=50)
+
+    assert len(index) == 47
+    assert {match["job_id"] for match in matches} == {str(i) for i in range(3, 50)}
@@ -0,0 +1,23 @@
+from app.models.database import JobRole
+from app.services.skill_index import get_skill_index, refresh_skill_index
+
+def _job(title, skills):
+    return JobRole(
+        title=title, description="d", required_skills=skills, career_path="A > B",
+        experience_level="entry", industry="Technology"
+    )
+
+def test_refresh_picks_up_jobs_written_by_other_workers(db):
+    db.add(_job("Analyst", ["Python"]))
+    db.commit()
+    refresh_skill_index()
+    index = get_skill_index()
+    assert [s["job_count"] for s in index.suggest("py", 10)] == [1]
+
+    # Written through another worker: this process's index is not told
+    db.add(_job("Engineer", ["Python", "PyTorch"]))
+    db.commit()
+    assert [s["skill"] for s in index.suggest("py", 10)] == ["Python"]
+
+    refresh_skill_index()
+    assert {s["skill"]: s["job_count"] for s in index.suggest("py", 10)} == {"Python": 2, "PyTorch": 1}
@@ -27,21 +27,27 @@ interface CareerMatch {
   skill_gaps: string[];
   recommended_learning: Array<{
     skill: string;
-    resources: Array<{
-      title: string;
-      type: string;
-      provider: string;
-      duration?: string;
-      difficulty: string;
-    }>;
+    resource_ids: string[];
   }>;
   career_progression: string[];
 }
 
+interface LearningResource {
+  id: string;
+  skill: string;
+  title: string;
+  type: string;
+  provider: string;
+  url?: string;
+  duration?: string;
+  difficulty: string;
+}
+
 interface SkillAnalysisResponse {
   matches: CareerMatch[];
   total_matches: number;
   analysis_summary: string;
+  learning_resources: Record<string, LearningResource>;
 }
 
 class CareerAdvisorAPI {